@@ -0,0 +1,147 @@
+import threading
+import time
+
+
+class Action:
+    """A named sequence of input steps, run in order on the executor's worker.
+
+    A step is a tuple (method, *args) sent to the input backend, e.g.
+    ('press', 'right'), ('wait', seconds) to pause without blocking anyone
+    else, or a plain callable.
+    """
+
+    def __init__(self, name, steps, trace=None):
+        self.name = name
+        self.steps = list(steps)
+        self.trace = trace  # tracing.Trace of the frame that triggered it
+        self.cancelled = False
+        self.submitted_at = time.perf_counter()
+
+
+class ActionExecutor:
+    """Runs input actions on a dedicated worker thread so the frame loop never waits on them.
+
+    The queue holds at most max_queue actions; when it is full the oldest
+    queued action is dropped rather than blocking the caller. Submitting with
+    coalesce=True replaces a still-queued action of the same name instead of
+    adding another one, so e.g. repeated cursor moves collapse to the newest.
+    cancel() drops queued actions and interrupts a running one at its next
+    step or wait.
+    """
+
+    def __init__(self, backend, max_queue=16, tracer=None):
+        self.backend = backend
+        self.max_queue = max_queue
+        self.tracer = tracer
+        self.queue = []
+        self.running = None
+        self.executed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self._cond = threading.Condition()
+        self._interrupt = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="action-executor", daemon=True)
+            self._thread.start()
+
+    def stop(self, cancel=True, timeout=1.0):
+        """Stops the worker, cancelling whatever is left unless cancel=False."""
+        if cancel:
+            self.cancel()
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, name, steps, coalesce=False):
+        """Queues an action and returns it at once. Starts the worker if needed."""
+        trace = self.tracer.current if self.tracer is not None else None
+        action = Action(name, steps, trace)
+        with self._cond:
+            if coalesce:
+                for i, queued in enumerate(self.queue):
+                    if queued.name == name:
+                        self.queue[i] = action
+                        self.coalesced += 1
+                        return action
+            if len(self.queue) >= self.max_queue:
+                self.queue.pop(0).cancelled = True
+                self.dropped += 1
+            self.queue.append(action)
+            self._cond.notify()
+        if self._thread is None:
+            self.start()
+        return action
+
+    def cancel(self, name=None):
+        """Cancels queued actions (all, or those with this name) and interrupts a matching running one."""
+        with self._cond:
+            kept = []
+            for action in self.queue:
+                if name is None or action.name == name:
+                    action.cancelled = True
+                    self.cancelled += 1
+                else:
+                    kept.append(action)
+            self.queue = kept
+            running = self.running
+            if running is not None and (name is None or running.name == name):
+                running.cancelled = True
+                self.cancelled += 1
+                self._interrupt.set()
+
+    def wait_idle(self, timeout=None):
+        """Blocks until the queue is empty and nothing is running. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self.queue or self.running is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self.queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                action = self.queue.pop(0)
+                self.running = action
+                self._interrupt.clear()
+            try:
+                self._execute(action)
+            except Exception as e:
+                print(f"Error running {action.name}: {e}")
+            finally:
+                with self._cond:
+                    self.running = None
+                    self.executed += 1
+                    self._cond.notify_all()
+
+    def _execute(self, action):
+        for step in action.steps:
+            if action.cancelled:
+                return
+            if callable(step):
+                step()
+                continue
+            method, args = step[0], step[1:]
+            if method == 'wait':
+                self._interrupt.wait(args[0])  # Returns early if the action is cancelled
+                continue
+            getattr(self.backend, method)(*args)
+            if self.tracer is not None:
+                self.tracer.emitted(method, args, action.trace)
@@ -0,0 +1,89 @@
+import os
+import threading
+from PIL import Image, ImageTk
+
+MEDIA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "media")
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".air_tracker", "asset_cache")
+
+_images = {}  # (name, size) -> resized PIL image
+_photos = {}  # (name, size) -> ImageTk.PhotoImage
+_lock = threading.Lock()
+
+
+def media_path(name):
+    """Portable path of a file in the media folder."""
+    return os.path.join(MEDIA_DIR, name)
+
+
+def load_icon(name, size):
+    """Returns media/<name> resized to size as an RGBA PIL image.
+
+    Each size is resized with LANCZOS once and then served from memory. The
+    result is also saved to CACHE_DIR, keyed on the source's modification
+    time, so later runs skip the resize entirely.
+    """
+    key = (name, tuple(size))
+    with _lock:
+        image = _images.get(key)
+        if image is None:
+            image = _render(name, key[1])
+            _images[key] = image
+        return image
+
+
+def photo_icon(name, size):
+    """Returns a cached ImageTk.PhotoImage of load_icon(name, size). Call from the Tk thread."""
+    key = (name, tuple(size))
+    photo = _photos.get(key)
+    if photo is None:
+        photo = ImageTk.PhotoImage(load_icon(name, size))
+        _photos[key] = photo
+    return photo
+
+
+def prewarm(icons):
+    """Renders (name, size) pairs ahead of time, e.g. off the Tk thread before the overlay opens."""
+    for name, size in icons:
+        try:
+            load_icon(name, size)
+        except Exception as e:
+            print(f"Error pre-rendering {name}: {e}")
+
+
+def clear_photos():
+    """Drops the cached PhotoImages, which belong to the Tk interpreter that created them."""
+    _photos.clear()
+
+
+def toolbar_layout(count, button_size, padding, screen_width, y):
+    """Returns (x1, y1, x2, y2) boxes for count buttons in one row centred on the screen."""
+    total_width = count * (button_size + padding) - padding
+    x_start = (screen_width - total_width) // 2
+    step = button_size + padding
+    return [
+        (x_start + i * step, y, x_start + i * step + button_size, y + button_size)
+        for i in range(count)
+    ]
+
+
+def _render(name, size):
+    source = media_path(name)
+    stem = os.path.splitext(name)[0]
+    cached = os.path.join(CACHE_DIR, f"{stem}_{size[0]}x{size[1]}_{os.stat(source).st_mtime_ns}.png")
+    if os.path.exists(cached):
+        try:
+            with Image.open(cached) as image:
+                return image.convert("RGBA")
+        except Exception as e:
+            print(f"Error reading cached icon {cached}: {e}")
+
+    with Image.open(source) as image:
+        image = image.convert("RGBA").resize(size, Image.LANCZOS)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = cached + ".tmp"
+        image.save(tmp_path, "PNG")
+        os.replace(tmp_path, cached)
+    except OSError as e:
+        print(f"Error caching icon {name}: {e}")
+    return image
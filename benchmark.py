@@ -0,0 +1,268 @@
+"""Per-stage benchmark of the gesture pipeline run by CameraHandler.update_frame.
+
+Feeds recorded or synthetic frames through flip, findHands, fingersUp,
+landmark smoothing, coordinate mapping, gesture dispatch, BGR->RGB conversion and PhotoImage
+update, then reports p50/p95/p99 latency, throughput and peak RSS as JSON.
+Peak RSS is only meaningful for the run as a whole, so it is not split by
+stage.
+
+The synthetic source draws a plain blob that MediaPipe does not take for a
+hand, so it only exercises the stages up to findHands and the display; use
+a recording of a real hand (replay:) to time the later stages.
+
+    python benchmark.py --source synthetic --frames 500 --output run.json
+    python benchmark.py --source replay:session.mp4 --compare baseline.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import cv2
+
+from camera import CameraHandler
+from frame_source import open_source
+from input_backend import RecordingBackend
+
+STAGES = ['flip', 'find_hands', 'fingers_up', 'smooth', 'map_coords', 'dispatch', 'bgr_to_rgb', 'photo_image']
+
+# Actions that would emit real input or open windows; replaced with no-ops while benchmarking
+SIDE_EFFECT_ACTIONS = [
+    'click_video', 'move_slide_forward', 'move_slide_backward', 'trigger_zoom_in',
+    'trigger_zoom_out', 'trigger_enter_key', 'close_application',
+]
+
+
+def peak_rss_mb():
+    """Returns the peak resident set size of this process in MB, or None if unknown."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def percentile(ordered, pct):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples_ms):
+    ordered = sorted(samples_ms)
+    mean = sum(ordered) / len(ordered) if ordered else 0.0
+    return {
+        'count': len(ordered),
+        'mean_ms': mean,
+        'p50_ms': percentile(ordered, 50),
+        'p95_ms': percentile(ordered, 95),
+        'p99_ms': percentile(ordered, 99),
+        'max_ms': ordered[-1] if ordered else 0.0,
+        'fps': 1000.0 / mean if mean else None,
+    }
+
+
+def make_handler(source, width, height, screen_size):
+    """Builds a headless CameraHandler whose actions do nothing."""
+    handler = CameraHandler(None, None, detection_mode='inline', source=source, screen_size=screen_size,
+                            input_backend=RecordingBackend(screen_size))
+    handler.width, handler.height = width, height
+    for name in SIDE_EFFECT_ACTIONS:
+        setattr(handler, name, lambda *args, **kwargs: None)
+    handler.canvas_handler.toggle_canvas = lambda: None
+    return handler
+
+
+def open_benchmark_source(spec, width, height, realtime):
+    """Opens the frame source named on the command line."""
+    if spec == 'synthetic':
+        return open_source(spec, width=width, height=height)
+    if spec.startswith('camera'):
+        return open_source(spec)
+    return open_source(spec, realtime=realtime)
+
+
+def run_benchmark(source_spec, frames, width, height, use_tk, realtime=False, warmup=10):
+    source = open_benchmark_source(source_spec, width, height, realtime)
+    handler = make_handler(source, width, height, screen_size=(1920, 1080))
+    if not handler.open_source():
+        raise SystemExit(f"Could not open frame source: {source_spec}")
+
+    root = sink = None
+    if use_tk:
+        try:
+            import tkinter as tk
+            from display import DisplaySink
+            root = tk.Tk()
+            root.withdraw()
+            sink = DisplaySink(tk.Label(root), width, height)
+        except Exception as e:
+            print(f"Tk unavailable, skipping PhotoImage stage: {e}", file=sys.stderr)
+            root = sink = None
+
+    timings = {stage: [] for stage in STAGES}
+    detector = handler.detector
+    clock = time.perf_counter
+    processed = 0
+    frame = None
+    hands_seen = 0
+    rss_at_start = None  # Peak RSS once warmup is over
+    start = clock()
+
+    while processed < frames + warmup:
+        success, img = source.read()
+        if not success:
+            break
+        if img.shape[:2] != (height, width):
+            # The capture thread scales frames to the pipeline size before update_frame sees them
+            img = cv2.resize(img, (width, height))
+        record = processed >= warmup
+        if record and rss_at_start is None:
+            rss_at_start = peak_rss_mb()
+        stage_times = {}
+
+        t0 = clock()
+        frame = cv2.flip(img, 1, dst=frame)
+        t1 = clock()
+        stage_times['flip'] = t1 - t0
+
+        hands, frame = detector.findHands(frame)
+        t2 = clock()
+        stage_times['find_hands'] = t2 - t1
+
+        if hands:
+            hands_seen += record
+            hand = hands[0]
+            fingers_up = detector.fingersUp(hand)
+            t3 = clock()
+            stage_times['fingers_up'] = t3 - t2
+
+            # Same smoothing as process_frame, on the same clock
+            lmlist = handler.landmark_filter(hand['lmList'], t3)
+            t_smooth = clock()
+            stage_times['smooth'] = t_smooth - t3
+
+            indexfinger = int(lmlist[8][0]), int(lmlist[8][1])
+            screen_x = int(handler.screen_width * (indexfinger[0] / handler.width))
+            screen_y = int(handler.screen_height * (indexfinger[1] / handler.height))
+            t4 = clock()
+            stage_times['map_coords'] = t4 - t_smooth
+
+            handler.handle_gestures(fingers_up, screen_x, screen_y, indexfinger)
+            stage_times['dispatch'] = clock() - t4
+        else:
+            handler.landmark_filter.reset()  # As process_frame does when the hand is lost
+
+        # Same work as DisplaySink.show, timed in two parts; the root is withdrawn so
+        # show() itself would skip the refresh
+        t5 = clock()
+        if sink is not None:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=sink.rgb)
+        else:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
+        t6 = clock()
+        stage_times['bgr_to_rgb'] = t6 - t5
+
+        if sink is not None:
+            sink.photo.paste(sink.image)
+            root.update_idletasks()
+            stage_times['photo_image'] = clock() - t6
+
+        if record:
+            for stage, seconds in stage_times.items():
+                timings[stage].append(seconds * 1000.0)
+        processed += 1
+
+    elapsed = clock() - start
+    source.release()
+    if root is not None:
+        root.destroy()
+
+    measured = max(processed - warmup, 0)
+    stages = {stage: summarize(timings[stage]) for stage in STAGES}
+    peak_rss = peak_rss_mb()
+    return {
+        'source': source_spec,
+        'frames': measured,
+        'frames_with_hand': hands_seen,
+        'frame_size': [width, height],
+        'wall_time_s': elapsed,
+        'pipeline_fps': processed / elapsed if elapsed else None,
+        'peak_rss_mb': peak_rss,
+        # Growth of the peak while measuring; warmup (model and MediaPipe start-up) is excluded
+        'rss_growth_mb': peak_rss - rss_at_start if peak_rss is not None and rss_at_start is not None else None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'opencv': cv2.__version__,
+        'stages': stages,
+    }
+
+
+def compare(current, baseline):
+    """Prints p95 changes per stage against a previous run."""
+    print(f"{'stage':<12} {'base p95':>10} {'new p95':>10} {'change':>8}", file=sys.stderr)
+    for stage in STAGES:
+        old = baseline.get('stages', {}).get(stage, {}).get('p95_ms')
+        new = current['stages'][stage]['p95_ms']
+        if not old:
+            change = 'n/a'
+        else:
+            change = f"{(new - old) / old * 100:+.1f}%"
+        print(f"{stage:<12} {old or 0:>10.3f} {new:>10.3f} {change:>8}", file=sys.stderr)
+
+
+def print_report(result):
+    print(f"{result['frames']} frames, {result['pipeline_fps'] or 0:.1f} fps, "
+          f"peak RSS {result['peak_rss_mb'] or 0:.1f} MB", file=sys.stderr)
+    print(f"{'stage':<12} {'p50':>8} {'p95':>8} {'p99':>8} {'fps':>9}", file=sys.stderr)
+    for stage, stats in result['stages'].items():
+        if not stats['count']:
+            continue
+        print(f"{stage:<12} {stats['p50_ms']:>8.3f} {stats['p95_ms']:>8.3f} "
+              f"{stats['p99_ms']:>8.3f} {stats['fps'] or 0:>9.1f}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default='synthetic',
+                        help="frame source: synthetic, camera:<index>, replay:<path> or a path. The synthetic "
+                             "frames contain no detectable hand, so fingers_up, smooth, map_coords and dispatch stay empty")
+    parser.add_argument('--frames', type=int, default=300, help="frames to measure")
+    parser.add_argument('--warmup', type=int, default=10, help="frames to run before measuring")
+    parser.add_argument('--width', type=int, default=300)
+    parser.add_argument('--height', type=int, default=200)
+    parser.add_argument('--realtime', action='store_true', help="pace replay at the recording's frame rate")
+    parser.add_argument('--no-tk', action='store_true', help="skip the PhotoImage stage")
+    parser.add_argument('--output', help="write JSON results to this file instead of stdout")
+    parser.add_argument('--compare', help="previous JSON result to compare p95 latencies against")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.source, args.frames, args.width, args.height,
+                           use_tk=not args.no_tk, realtime=args.realtime, warmup=args.warmup)
+    print_report(result)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
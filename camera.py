@@ -1,46 +1,83 @@
 import os
 import cv2
-from PIL import Image, ImageTk
-from cvzone.HandTrackingModule import HandDetector
-import pyautogui
+import numpy as np
 import time
-from tkinter import Label
-import comtypes.client
-import keras
-from canvas_handler import CanvasHandler
-
-# Set Keras backend to "jax"
-os.environ["KERAS_BACKEND"] = "jax"
+from canvas_handler import CanvasHandler, choose_annotation_backend
+from capture import CaptureThread, LatencyStats
+from display import DisplaySink
+from detection_worker import DetectionEngine, draw_hand
+from frame_source import open_source
+from cvzone.HandTrackingModule import HandDetector
+from scheduler import AdaptiveScheduler
+from gestures import GESTURES, NO_GESTURE
+from debounce import GestureDebouncer
+from cooldowns import shared_cooldowns
+from tk_monitor import shared_monitor
+from input_backend import open_backend
+from action_executor import ActionExecutor
+from tracing import FrameTracer
+from model_manager import gesture_models
+from gesture_model import inference_from_env
+from filters import make_filter
+from slide_annotations import SlideTracker, SlideAnnotationStore, presentation_key
+
+# Debouncing filters out single-frame misdetections, so a lower (cheaper) detection confidence is enough
+DETECTION_CONFIDENCE = 0.5
 
-# Import Keras and load the model with error handling
-try:
-    model = keras.saving.load_model("hf://saaday5/hand_gesture_model")
-except FileNotFoundError as e:
-    print(f"Error loading model: {e}")
 
 class CameraHandler:
     """Handles the camera feed and gesture detection."""
 
-    def __init__(self, camera_label, master):
-        self.camera_label = camera_label
+    def __init__(self, camera_label, master, detection_mode='process', source=None, screen_size=None,
+                 smoothing='balanced', ppt_file=None, input_backend=None,
+                 gesture_inference=None, slides=None, annotation_backend=None):
+        self.camera_label = camera_label  # None runs the pipeline headless
         self.master = master
-        self.detector = HandDetector(detectionCon=0.7, maxHands=1)
-        self.cap = cv2.VideoCapture(0)
+        self.cap = open_source(source)  # Live camera unless a replay/synthetic source is given
         self.width, self.height = 300, 200
-        self.video_toggle_cooldown = False
-        self.slide_toggle_cooldown = False
-        self.zoom_out_cooldown = False
-        self.zoom_in_cooldown = False
-        self.enter_cooldown = False
-        self.close_cooldown = False
+        # 'process' runs MediaPipe in a worker process, 'inline' on the Tk loop
+        self.detector = None
+        self.detection_engine = None
+        if detection_mode == 'process':
+            self.detection_engine = DetectionEngine(self.width, self.height, detection_con=DETECTION_CONFIDENCE)
+        else:
+            self.detector = HandDetector(detectionCon=DETECTION_CONFIDENCE, maxHands=1)
+        self.last_result_seq = 0
+        self.submitted_traces = {}  # Detection process frame seq -> trace of the frame submitted
+        self.last_hands = []
+        self.capture = CaptureThread(self.cap, self.width, self.height)
+        self.last_frame_seq = 0
+        self.frame = None  # Working copy of the newest frame, reused every update
+        self.clean_frame = None  # Undrawn copy of the frame for crop-based gesture inference
+        self.scheduler = AdaptiveScheduler()  # Detection rate follows drawing, motion and idleness
+        self.debouncer = GestureDebouncer(len(GESTURES.gestures))  # 3 of 5 frames must agree
+        self.display_latency = LatencyStats()  # Capture-to-display latency
+        # Smooths all 21 landmarks before the fingertip is scaled up to screen resolution
+        self.landmark_filter = make_filter(smoothing)
+        self.display = None  # DisplaySink, created on the Tk thread by the first update
+        self.cooldowns = shared_cooldowns  # Deadlines per cooldown group, shared across overlays
+        self.loop_monitor = shared_monitor  # Measures lag and duration of our after() callbacks
+        # Keystrokes and mouse events go through a swappable backend so actions can be recorded headless
+        self.input = input_backend or open_backend()
+        self.tracer = FrameTracer()  # Capture-to-keystroke timestamps per frame
+        self.models = gesture_models  # Loaded in the background once the camera starts
+        # Optional learned classifier; classification falls back to fingersUp without it
+        self.gesture_inference = gesture_inference or inference_from_env(self.models)
+        self.frame_id = 0  # Frames with a hand, the key model results are merged back by
+        # Input actions run on their own worker so waits inside them never stall frame processing
+        self.actions = ActionExecutor(self.input, tracer=self.tracer)
         self.video_playing = False
         self.is_pen_active = False
         self.is_highlighter_active = False
         self.drawing_active = False
         self.last_x, self.last_y = None, None
-        self.screen_width, self.screen_height = pyautogui.size()
-        self.drawing_positions = [[]]  # List to store drawing strokes
-        self.canvas_handler = CanvasHandler(master, self) # Pass root to CanvasHandler
+        self.screen_width, self.screen_height = screen_size or self.input.size()
+        # PowerPoint's show position (reported by the thread running the slideshow), or a simulated counter
+        self.slides = slides or SlideTracker()
+        self.slide_store = SlideAnnotationStore(presentation_key(ppt_file))
+        # Vector canvas lines or raster RGBA tiles, picked by $AIR_TRACKER_ANNOTATIONS unless given
+        self.canvas_handler = CanvasHandler(master, self, annotation_backend=choose_annotation_backend(annotation_backend),
+                                            slide_store=self.slide_store) # Pass root to CanvasHandler
         self.current_tool = 'pen'  # Default tool
     
     def set_drawing_color(self, color):
@@ -60,174 +97,266 @@ class CameraHandler:
             self.is_pen_active = False
             self.is_highlighter_active = False
 
-    def start_camera(self):
-        """Starts the camera feed and initializes gesture detection."""
+    def open_source(self):
+        """Configures the frame source and starts detection. Returns False if it could not be opened."""
         if not self.cap.isOpened():
             print("Error: Could not open video device.")
-            return
+            return False
 
         self.cap.set(3, self.width)  # Set width
         self.cap.set(4, self.height)  # Set height
 
-        self.update_frame()
+        if self.detection_engine is not None:
+            try:
+                self.detection_engine.start()
+            except Exception as e:
+                print(f"Error starting detection process, using in-process detection: {e}")
+                self.detection_engine = None
+        return True
+
+    def start_camera(self):
+        """Starts the camera feed and initializes gesture detection."""
+        if not self.open_source():
+            return
+
+        self.capture.start()
+        if self.gesture_inference is not None:
+            # Only the learned classifier needs the model; fingersUp alone never loads it
+            self.models.warmup()
+            self.gesture_inference.start()
+        # start_camera runs on a worker thread, so hand the first update to the Tk loop
+        self.loop_monitor.after(self.camera_label, 0, self.update_frame)
+
+    def run_headless(self, max_frames=None):
+        """Runs the gesture pipeline without Tk, processing every frame of the source in order.
+
+        Detection always runs inline here, since the detection process only
+        returns its newest result and would skip frames. Returns the number of
+        frames processed.
+        """
+        self.detection_engine = None  # Not started yet, open_source() does that
+        if not self.open_source():
+            return 0
+        if self.gesture_inference is not None:
+            self.gesture_inference.start()
+
+        processed = 0
+        scaled = None
+        while max_frames is None or processed < max_frames:
+            success, img = self.cap.read()
+            if not success:
+                break
+            self.tracer.begin()
+            if img.shape[:2] != (self.height, self.width):
+                # Replays ignore set(3/4); scale like CaptureThread so coordinates map to the screen
+                img = scaled = cv2.resize(img, (self.width, self.height), dst=scaled)
+            self.frame = cv2.flip(img, 1, dst=self.frame)
+            self.process_frame(self.frame)
+            processed += 1
+        return processed
 
     def update_frame(self):
-        """Captures frames from the camera and processes gestures."""
-        success, img = self.cap.read()
-        if success:
-            img = cv2.flip(img, 1)
-            hands, img = self.detector.findHands(img)
-
-            if hands:
-                hand = hands[0]
-                fingers_up = self.detector.fingersUp(hand)
-                lm_index = hand['lmList'][8] 
-                lmlist = hand['lmList']
-                indexfinger = lmlist[8][0], lmlist[8][1]  # Index finger tip coordinates
-                
-                # Map camera coordinates to screen coordinates
-                screen_x = int(self.screen_width * (indexfinger[0] / self.width))
-                screen_y = int(self.screen_height * (indexfinger[1] / self.height))
-
-                self.handle_gestures(fingers_up, screen_x, screen_y, indexfinger)
-
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            img_pil = Image.fromarray(img_rgb)
-            img_tk = ImageTk.PhotoImage(image=img_pil)
-
-            self.camera_label.img_tk = img_tk
-            self.camera_label.config(image=img_tk)
-
-        self.camera_label.after(30, self.update_frame)
+        """Processes the newest captured frame, if any, and reschedules itself."""
+        position = self.slides.poll()
+        if position is not None:
+            self.canvas_handler.show_slide(position)  # PowerPoint moved on its own (clicker, keyboard, ...)
+
+        latest = self.capture.buffer.acquire_latest(self.last_frame_seq)
+        if latest is not None:
+            slot, seq, captured_at = latest
+            self.last_frame_seq = seq
+            self.tracer.begin(captured_at)
+            # Flip into our own buffer so the capture thread gets the slot back right away
+            self.frame = cv2.flip(self.capture.buffer.frames[slot], 1, dst=self.frame)
+            self.capture.buffer.release(slot)
+            img = self.frame
+
+            if self.scheduler.should_detect(self.canvas_handler.is_drawing_mode):
+                self.process_frame(img)
+            elif self.detection_engine is not None:
+                for hand in self.last_hands:
+                    draw_hand(img, hand)
+
+            if self.display is None:
+                self.display = DisplaySink(self.camera_label, self.width, self.height)
+            if self.display.show(img):
+                self.display_latency.add(time.perf_counter() - captured_at)
+
+        self.loop_monitor.after(self.camera_label, self.scheduler.poll_delay(self.canvas_handler.is_drawing_mode), self.update_frame)
+
+    def process_frame(self, img):
+        """Runs detection on a mirrored frame and dispatches the resulting gesture."""
+        clean = img
+        if self.gesture_inference is not None and self.gesture_inference.input_kind == 'crop':
+            # detect_hands draws the skeleton onto img; the model has to see the hand without it
+            if self.clean_frame is None or self.clean_frame.shape != img.shape:
+                self.clean_frame = np.empty_like(img)
+            np.copyto(self.clean_frame, img)
+            clean = self.clean_frame
+        hands = self.detect_hands(img)
+        if hands is not None:
+            self.scheduler.observe(hands, self.width)
+
+        if hands:
+            hand = hands[0]
+            fingers_up = hand['fingers']
+            self.frame_id += 1
+            if self.gesture_inference is not None:
+                self.gesture_inference.submit(self.frame_id, hand, clean)
+            lmlist = self.landmark_filter(hand['lmList'], time.perf_counter())
+            indexfinger = int(lmlist[8][0]), int(lmlist[8][1])  # Smoothed index finger tip coordinates
+
+            # Map camera coordinates to screen coordinates
+            screen_x = int(self.screen_width * (indexfinger[0] / self.width))
+            screen_y = int(self.screen_height * (indexfinger[1] / self.height))
+
+            self.handle_gestures(fingers_up, screen_x, screen_y, indexfinger)
+        elif hands is not None:
+            self.debouncer.update(NO_GESTURE)  # No hand counts against whatever was active
+            self.landmark_filter.reset()  # Don't smooth the next hand towards where this one was lost
+        return hands
+
+    def detect_hands(self, img):
+        """Detects hands in img and draws them on it.
+
+        Returns cvzone-style hand dicts with an added 'fingers' entry. With the
+        detection process, the frame is submitted to the worker and the newest
+        finished result is returned, or None if there is nothing new yet.
+        """
+        if self.detection_engine is not None:
+            if self.detection_engine.is_alive():
+                submitted = self.detection_engine.submit(img)
+                self.submitted_traces[submitted] = self.tracer.current
+                self.tracer.mark('submit')
+                latest = self.detection_engine.latest_result(self.last_result_seq)
+                hands = None
+                # Whatever is decided next belongs to the frame the result was computed from
+                self.tracer.current = None
+                if latest is not None:
+                    self.last_result_seq, hands = latest
+                    self.last_hands = hands
+                    self.tracer.current = self.submitted_traces.pop(self.last_result_seq, None)
+                    self.tracer.mark('detect')
+                    for seq in [seq for seq in self.submitted_traces if seq < self.last_result_seq]:
+                        del self.submitted_traces[seq]  # Dropped before the worker got to them
+                for hand in self.last_hands:
+                    draw_hand(img, hand)
+                return hands
+            print("Detection process exited, falling back to in-process detection.")
+            self.detection_engine = None
+
+        if self.detector is None:
+            self.detector = HandDetector(detectionCon=DETECTION_CONFIDENCE, maxHands=1)
+        hands, img = self.detector.findHands(img)
+        for hand in hands:
+            hand['fingers'] = self.detector.fingersUp(hand)
+        self.tracer.mark('detect')
+        return hands
 
     def handle_gestures(self, fingers_up, screen_x, screen_y, indexfinger):
-        """Handles gestures based on finger configurations."""
-        # Canvas activation/deactivation
-        if fingers_up == [0, 1, 0, 0, 1]:  # Index and pinky fingers
-            if not self.canvas_handler.canvas_cooldown:
-                self.canvas_handler.toggle_canvas()
-                self.canvas_handler.canvas_cooldown = True
-                self.camera_label.after(2000, self.canvas_handler.reset_canvas_cooldown)
+        """Looks up the gesture for the finger configuration and dispatches it.
+
+        Drawing and pointing follow the raw per-frame classification; every
+        other gesture only fires once the debouncer has confirmed it.
+        """
+        if self.gesture_inference is not None:
+            gesture = self.gesture_inference.classify(self.frame_id, fingers_up)
+        else:
+            gesture = GESTURES.classify(fingers_up)
+        self.tracer.mark('classify')
+        confirmed = self.debouncer.update(gesture.index if gesture else NO_GESTURE)
+        self.tracer.mark('debounce')
+
+        if gesture is not None and gesture.continuous:
+            if gesture.name == 'draw':
+                self.handle_draw(screen_x, screen_y)
             else:
-                # If cooldown is active, do not toggle the canvas
-                pass
-        
-        if fingers_up == [0, 1, 0, 0, 0]:  # Index finger up (drawing mode with pointer)
-            self.canvas_handler.set_drawing_mode(True)
-            if self.canvas_handler.canvas:
-                x, y = screen_x, screen_y
-
-                # Ensure pointer moves along while drawing
-                self.canvas_handler.canvas.delete("pointer")
-                self.canvas_handler.canvas.create_oval(
-                    x - 5, y - 5, x + 5, y + 5,
-                    fill=self.canvas_handler.current_color, outline="black", tags="pointer"
-                )
-
-                # 🚀 BLOCK DRAWING OVER BUTTONS!
-                if self.canvas_handler.check_pointer_over_buttons(x, y):
-                    self.canvas_handler.set_drawing_mode(False)
-                    return  
-
-                if self.last_x is not None and self.last_y is not None:
-                    self.canvas_handler.canvas.create_line(
-                        self.last_x, self.last_y, x, y, fill=self.canvas_handler.current_color, width=5, smooth=True
-                    )
-
-                self.last_x, self.last_y = x, y
-
-        elif fingers_up == [0, 1, 1, 0, 0]:  # Index and middle finger up (Pointer Mode)
-            self.canvas_handler.set_drawing_mode(False)  # Exit drawing mode
-            if self.canvas_handler.canvas:
-                self.canvas_handler.canvas.delete("pointer")
-                self.canvas_handler.canvas.create_oval(
-                    screen_x - 5, screen_y - 5, screen_x + 5, screen_y + 5,
-                    fill=self.canvas_handler.current_color, outline="black", tags="pointer"
-                )
-                self.last_x, self.last_y = None, None  # Reset drawing positions
-
-            # Check if the pointer is hovering over a button
-            self.canvas_handler.check_pointer_over_buttons(screen_x, screen_y)
-        # Video control with thumb and index finger
-        if fingers_up == [1, 1, 0, 0, 0] and not self.video_toggle_cooldown:
-            print("Gesture detected: Toggle Video")
-            self.click_video()
+                self.handle_pointer(screen_x, screen_y)
+        if confirmed == NO_GESTURE:
+            return
+
+        gesture = GESTURES.gestures[confirmed]
+        if gesture.continuous:
+            return
+        if gesture.name == 'toggle_canvas':
+            self.canvas_handler.toggle_canvas()  # Applies the canvas cooldown itself
+        else:
+            self.dispatch_action(gesture)
+
+    def dispatch_action(self, gesture):
+        """Runs a discrete gesture's action unless its cooldown group is still cooling down."""
+        if not self.cooldowns.trigger(gesture.cooldown_group, gesture.cooldown):
+            return
+
+        print(f"Gesture detected: {gesture.label}")
+        self.tracer.mark('dispatch')
+        getattr(self, gesture.action)()
+        if gesture.name == 'toggle_video':
             self.video_playing = not self.video_playing
-            self.video_toggle_cooldown = True
-            self.camera_label.after(2000, self.reset_video_toggle_cooldown)
-
-        # Enter key with last three fingers
-        elif fingers_up == [0, 0, 1, 1, 1] and not self.enter_cooldown:  # Middle, ring, and pinky for enter
-            print("Gesture detected: Press Enter")
-            pyautogui.press('enter')
-            self.enter_cooldown = True
-            self.camera_label.after(1000, self.reset_enter_cooldown)
-
-        # Slide navigation
-        elif fingers_up == [1, 0, 0, 0, 0] and not self.slide_toggle_cooldown:  # Thumb only for previous
-            print("Gesture detected: Move Slide Backward")
-            self.move_slide_backward()
-            self.slide_toggle_cooldown = True
-            self.camera_label.after(1000, self.reset_slide_toggle_cooldown)
-        elif fingers_up == [0, 0, 0, 0, 1] and not self.slide_toggle_cooldown:  # Pinky only for next
-            print("Gesture detected: Move Slide Forward")
-            self.move_slide_forward()
-            self.slide_toggle_cooldown = True
-            self.camera_label.after(1000, self.reset_slide_toggle_cooldown)
-
-        # Zoom controls
-        elif fingers_up == [0, 1, 1, 1, 0] and not self.zoom_in_cooldown:  # Three middle fingers for zoom in
-            print("Gesture detected: Zoom In")
-            self.trigger_zoom_in()
-            self.zoom_in_cooldown = True
-            self.camera_label.after(1500, self.reset_zoom_in_cooldown)
-        elif fingers_up == [0, 1, 1, 1, 1] and not self.zoom_out_cooldown:  # Four fingers for zoom out
-            print("Gesture detected: Zoom Out")
-            self.trigger_zoom_out()
-            self.zoom_out_cooldown = True
-            self.camera_label.after(1500, self.reset_zoom_out_cooldown)
-
-        # Close application with thumb and pinky up
-        elif fingers_up == [1, 0, 0, 0, 1] and not self.close_cooldown:
-            print("Gesture detected: Close Application")
-            self.close_application()
-            self.close_cooldown = True
-            self.camera_label.after(2000, self.reset_close_cooldown)
+        self.scheduler.hold(gesture.cooldown)
+
+    def handle_draw(self, x, y):
+        """Index finger up: draws on the canvas overlay and moves the pointer along."""
+        self.canvas_handler.set_drawing_mode(True)
+        if self.canvas_handler.canvas:
+            # Ensure pointer moves along while drawing
+            self.canvas_handler.pointer.move(x, y)
+
+            # 🚀 BLOCK DRAWING OVER BUTTONS!
+            if self.canvas_handler.check_pointer_over_buttons(x, y):
+                self.canvas_handler.set_drawing_mode(False)
+                return
+
+            # Extends the active polyline, or starts one on the first point or a style change
+            self.canvas_handler.strokes.add_point(
+                x, y, self.canvas_handler.current_color, 5, self.current_tool, smooth=True
+            )
+
+            self.last_x, self.last_y = x, y
+
+    def handle_pointer(self, screen_x, screen_y):
+        """Index and middle finger up: moves the pointer without drawing."""
+        self.canvas_handler.set_drawing_mode(False)  # Exit drawing mode
+        if self.canvas_handler.canvas:
+            self.canvas_handler.pointer.move(screen_x, screen_y)
+            self.last_x, self.last_y = None, None  # Reset drawing positions
+
+        # Check if the pointer is hovering over a button
+        self.canvas_handler.check_pointer_over_buttons(screen_x, screen_y)
 
     def handle_pen_mode(self, screen_x, screen_y):
         """Handles pen drawing mode."""
         if not self.is_pen_active:
             self.deactivate_highlighter()
-            pyautogui.hotkey('ctrl', 'p')
             self.is_pen_active = True
             self.last_x, self.last_y = screen_x, screen_y  # Store initial point
-            pyautogui.moveTo(screen_x, screen_y)  # Move cursor to start point
-            time.sleep(0.1)  # Small delay to stabilize cursor movement
+            # Move cursor to start point and give it a moment to stabilize, on the action worker
+            self.actions.submit('pen_mode', [('hotkey', 'ctrl', 'p'), ('moveTo', screen_x, screen_y), ('wait', 0.1)])
 
         self.drawing_active = True
-        pyautogui.mouseDown(button='left')
-        pyautogui.moveTo(screen_x, screen_y)  # Ensure drawing starts from initial point
+        # Ensure drawing starts from initial point; only the newest queued position is worth sending
+        self.actions.submit('draw_move', [('mouseDown', 'left'), ('moveTo', screen_x, screen_y)], coalesce=True)
         self.last_x, self.last_y = screen_x, screen_y
 
     def handle_highlighter_mode(self, screen_x, screen_y):
         """Handles highlighter drawing mode."""
         if not self.is_highlighter_active:
             self.deactivate_pen()
-            pyautogui.hotkey('ctrl', 'i')
             self.is_highlighter_active = True
             self.last_x, self.last_y = screen_x, screen_y  # Store initial point
-            pyautogui.moveTo(screen_x, screen_y)  # Move cursor to start point
-            time.sleep(0.1)  # Small delay to stabilize cursor movement
+            # Move cursor to start point and give it a moment to stabilize, on the action worker
+            self.actions.submit('highlighter_mode', [('hotkey', 'ctrl', 'i'), ('moveTo', screen_x, screen_y), ('wait', 0.1)])
 
         self.drawing_active = True
-        pyautogui.mouseDown(button='left')
-        pyautogui.moveTo(screen_x, screen_y)  # Ensure drawing starts from initial point
+        # Ensure drawing starts from initial point; only the newest queued position is worth sending
+        self.actions.submit('draw_move', [('mouseDown', 'left'), ('moveTo', screen_x, screen_y)], coalesce=True)
         self.last_x, self.last_y = screen_x, screen_y
 
     def deactivate_drawing_tools(self):
         """Deactivates all drawing tools."""
         if self.drawing_active:
-            pyautogui.mouseUp(button='left')
+            self.actions.cancel('draw_move')  # Queued moves would drag after the button is released
+            self.actions.submit('mouse_up', [('mouseUp', 'left')])
         self.drawing_active = False
         self.is_pen_active = False
         self.is_highlighter_active = False
@@ -235,62 +364,107 @@ class CameraHandler:
     def deactivate_pen(self):
         """Deactivates pen tool."""
         if self.is_pen_active:
-            pyautogui.mouseUp(button='left')
+            self.actions.cancel('draw_move')
+            self.actions.submit('mouse_up', [('mouseUp', 'left')])
             self.is_pen_active = False
 
     def deactivate_highlighter(self):
         """Deactivates highlighter tool."""
         if self.is_highlighter_active:
-            pyautogui.mouseUp(button='left')
+            self.actions.cancel('draw_move')
+            self.actions.submit('mouse_up', [('mouseUp', 'left')])
             self.is_highlighter_active = False
 
     def click_video(self):
         """Simulates a mouse click to toggle video playback."""
         try:
-            pyautogui.moveTo(self.screen_width // 2 + 50, self.screen_height // 2)
-            time.sleep(1)
-            pyautogui.moveTo(self.screen_width // 2, self.screen_height // 2)
-            pyautogui.hotkey('alt', 'p')
+            # The one-second wait runs on the action worker, tracking carries on meanwhile
+            self.actions.submit('click_video', [
+                ('moveTo', self.screen_width // 2 + 50, self.screen_height // 2),
+                ('wait', 1.0),
+                ('moveTo', self.screen_width // 2, self.screen_height // 2),
+                ('hotkey', 'alt', 'p'),
+            ])
         except Exception as e:
             print(f"Error toggling video: {e}")
 
     def move_slide_forward(self):
         """Simulates the 'right' arrow key to move forward in the presentation."""
         try:
-            pyautogui.press('right')
+            self.actions.submit('move_slide_forward', [('press', 'right')])
+            self.change_slide(1)
         except Exception as e:
             print(f"Error moving forward: {e}")
 
     def move_slide_backward(self):
         """Simulates the 'left' arrow key to move backward in the presentation."""
         try:
-            pyautogui.press('left')
+            self.actions.submit('move_slide_backward', [('press', 'left')])
+            self.change_slide(-1)
         except Exception as e:
             print(f"Error moving backward: {e}")
 
+    def change_slide(self, delta):
+        """Switches the annotation layer to the slide the presentation is expected to be on."""
+        self.canvas_handler.show_slide(self.slides.step(delta))
+        if self.camera_label is not None:
+            # PowerPoint may not act on the key press (or only ran an animation); once its position
+            # has been read again (every 0.5 s), settle on it
+            self.loop_monitor.after(self.camera_label, 1200, self.sync_slide)
+
+    def sync_slide(self):
+        """Follows PowerPoint's actual show position, if it has been reported."""
+        position = self.slides.poll(settle=True)
+        if position is not None:
+            self.canvas_handler.show_slide(position)
+
     def trigger_zoom_out(self):
         """Simulates zoom-out action."""
         try:
-            pyautogui.hotkey('ctrl', '-')
+            self.actions.submit('zoom_out', [('hotkey', 'ctrl', '-')])
         except Exception as e:
             print(f"Error performing zoom-out: {e}")
 
     def trigger_zoom_in(self):
         """Simulates zoom-in action."""
         try:
-            pyautogui.hotkey('ctrl', '+')
+            self.actions.submit('zoom_in', [('hotkey', 'ctrl', '+')])
         except Exception as e:
             print(f"Error performing zoom-in: {e}")
 
+    def trigger_enter_key(self):
+        """Simulates pressing the 'Enter' key."""
+        try:
+            self.actions.submit('enter', [('press', 'enter')])
+        except Exception as e:
+            print(f"Error pressing Enter key: {e}")
+
     def close_application(self):
-        """Closes the application with quick cleanup."""
+        """Closes the application with quick cleanup. A recording input backend only records it."""
         try:
+            # Flush the current slide's ink before anything else can fail
+            self.canvas_handler.save_slide_annotations()
+
             # Force quit PowerPoint first to prevent any prompts
-            os.system('taskkill /F /IM POWERPNT.EXE')
-            
+            if not self.input.quit():
+                return
+
             # Release camera resources
+            if hasattr(self, 'capture'):
+                self.capture.stop()
+            if self.detection_engine is not None:
+                self.detection_engine.stop()
+            if self.gesture_inference is not None:
+                self.gesture_inference.stop()
+            self.actions.stop()
             if hasattr(self, 'cap') and self.cap is not None:
                 self.cap.release()
+            if self.loop_monitor.stats:
+                print(self.loop_monitor.report())
+            if self.display_latency.samples:
+                latency = self.display_latency.summary()
+                print(f"Capture-to-display latency: n={latency['count']} p50={latency['p50_ms']:.1f}ms "
+                      f"p95={latency['p95_ms']:.1f}ms max={latency['max_ms']:.1f}ms")
             cv2.destroyAllWindows()
 
             # Immediate exit
@@ -299,27 +473,8 @@ class CameraHandler:
             # Force exit if any error occurs
             os._exit(0)
 
-    def reset_video_toggle_cooldown(self):
-        self.video_toggle_cooldown = False
-
-    def reset_slide_toggle_cooldown(self):
-        self.slide_toggle_cooldown = False
-
-    def reset_zoom_out_cooldown(self):
-        self.zoom_out_cooldown = False
-
-    def reset_zoom_in_cooldown(self):
-        self.zoom_in_cooldown = False
-
-    def reset_enter_cooldown(self):
-        """Resets the enter key cooldown."""
-        self.enter_cooldown = False
-
-    def reset_close_cooldown(self):
-        """Resets the close application cooldown."""
-        self.close_cooldown = False
-
-def start_camera(camera_label):
+def start_camera(camera_label, source=None, ppt_file=None, slides=None):
     """Starts the camera feed and initializes gesture detection."""
-    camera_handler = CameraHandler(camera_label, camera_label.master)
+    camera_handler = CameraHandler(camera_label, camera_label.master, source=source, ppt_file=ppt_file,
+                                   slides=slides)
     camera_handler.start_camera()
\ No newline at end of file
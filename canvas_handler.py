@@ -1,31 +1,61 @@
+import os
 import tkinter as tk
-from PIL import Image, ImageTk
-import pyautogui
-import time
+from strokes import StrokeLayer
+from raster_layer import RasterAnnotationLayer
+from cooldowns import shared_cooldowns
+from gestures import GESTURES
+from hit_test import GridHitIndex
+from pointer import PointerItem
+import assets
+
+ANNOTATION_ENV_VAR = "AIR_TRACKER_ANNOTATIONS"
+PALETTE_COLORS = ['black', 'red', 'blue', 'green', 'yellow', 'orange', 'purple', 'pink']
+TOOL_ICONS = [('pen', 'pen.png'), ('highlighter', 'highlighter.png'), ('eraser', 'eraser.png')]
+
+
+def choose_annotation_backend(name=None):
+    """Returns the annotation backend named by name or $AIR_TRACKER_ANNOTATIONS: 'vector' (default) or 'raster'."""
+    name = (name or os.environ.get(ANNOTATION_ENV_VAR) or 'vector').lower()
+    if name not in ('vector', 'raster'):
+        raise ValueError(f"Unknown annotation backend: {name}")
+    return name
+
 
 class CanvasHandler:
-    def __init__(self, root, camera_handler):
+    def __init__(self, root, camera_handler, annotation_backend='vector', slide_store=None):
         self.root = root
         self.camera_handler = camera_handler  # Store the CameraHandler instance
         self.canvas_window = None
         self.canvas = None
+        self.strokes = None  # StrokeLayer or RasterAnnotationLayer of the current canvas
+        self.annotation_backend = annotation_backend  # 'vector' canvas lines or 'raster' RGBA tiles
+        self.slide_store = slide_store  # SlideAnnotationStore, None keeps annotations in memory only
+        self.current_slide = 1
         self.is_canvas_active = False
-        self.canvas_cooldown = False
+        self.cooldowns = getattr(camera_handler, 'cooldowns', shared_cooldowns)
         self.last_x, self.last_y = None, None
         self.current_color = 'black'  # Default drawing color
         self.current_tool = 'pen'  # Default tool
-        self.cursor = None  # Cursor to show selected color
+        self.pointer = None  # PointerItem showing the fingertip in the selected color
+        self.pointer_lead = 0.03  # Seconds of motion prediction to hide detection latency
         self.color_buttons = []  # List to store color buttons
         self.tool_buttons = []  # List to store tool buttons
+        self.button_size = 40  # Width and height of palette and tool buttons
+        self.hit_index = GridHitIndex()  # Toolbar hit-test grid, rebuilt after layout
+        self.hovered_button = None  # ('color', button, color) or ('tool', button, tool)
         self.canvas_x_offset = 0  # Initial offset, starts at 0
         self.canvas_shift_amount = 20  # Pixels to shift right each time
         self.is_drawing_mode = False  # New state variable to track drawing mode
+        # Resize the tool icons now, off the Tk thread, so the first toggle only creates items
+        assets.prewarm((name, (self.button_size, self.button_size)) for _, name in TOOL_ICONS)
 
     def set_drawing_mode(self, is_drawing):
         """Set the drawing mode."""
         self.is_drawing_mode = is_drawing
         if not is_drawing:
             self.last_x, self.last_y = None, None  # Reset drawing positions
+            if self.strokes:
+                self.strokes.end()
 
 
     def create_canvas_overlay(self):
@@ -51,28 +81,29 @@ class CanvasHandler:
 
         self.canvas = tk.Canvas(self.canvas_window, bg='grey', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        if self.annotation_backend == 'raster':
+            self.strokes = RasterAnnotationLayer(self.canvas, screen_width, screen_height)
+        else:
+            self.strokes = StrokeLayer(self.canvas)
 
-        self.add_color_palette()
-        self.add_tool_buttons()
-
-        self.cursor = self.canvas.create_oval(0, 0, 20, 20, fill=self.current_color, outline='black')
-
-    def add_color_palette(self):
-        """Adds a color palette inside the canvas."""
-        colors = ['black', 'red', 'blue', 'green', 'yellow', 'orange', 'purple', 'pink']  # Define the colors for the palette
+        # Colors and tools share one centred row, laid out once
+        slots = assets.toolbar_layout(
+            len(PALETTE_COLORS) + len(TOOL_ICONS), self.button_size, 5, screen_width, 40
+        )
+        self.add_color_palette(slots[:len(PALETTE_COLORS)])
+        self.add_tool_buttons(slots[len(PALETTE_COLORS):])
+        self.build_hit_index()
 
-        button_size = 40  # Reduced button size
-        padding = 5  # Reduced padding between buttons
-        total_width = len(colors) * (button_size + padding) - padding  # Calculate total width of the palette
-        screen_width = self.root.winfo_screenwidth()
+        self.pointer = PointerItem(self.canvas, fill=self.current_color, lead=self.pointer_lead)
 
-        # Position the palette at the center top
-        x_start = (screen_width - total_width) // 2
-        y = 40  # Slightly up from the top
+        # Saved ink goes in last, once the toolbar and pointer it is stacked under exist
+        self.load_slide_annotations()
 
-        for color in colors:
+    def add_color_palette(self, slots):
+        """Adds a color palette inside the canvas, one color per (x1, y1, x2, y2) slot."""
+        for (x1, y1, x2, y2), color in zip(slots, PALETTE_COLORS):
             button = self.canvas.create_rectangle(
-                x_start, y, x_start + button_size, y + button_size,
+                x1, y1, x2, y2,
                 fill=color,
                 outline='black'  # Black boundary for color buttons
             )
@@ -85,47 +116,22 @@ class CanvasHandler:
             self.canvas.tag_bind(button, "<Enter>", lambda event, btn=button, c=color: self.on_hover(btn, c))
             self.canvas.tag_bind(button, "<Leave>", lambda event, btn=button, c=color: self.on_leave(btn, c))
 
-            x_start += button_size + padding  # Move to the next color position
-
-    def add_tool_buttons(self):
-        """Adds tool buttons (pen, highlighter, eraser) inside the canvas."""
-        tools = [
-            ('pen', r"media\pen.png"),
-            ('highlighter', r"media\highlighter.png"),
-            ('eraser', r"media\eraser.png")
-        ]
-
-        button_size = 40  # Reduced button size
-        padding = 5  # Reduced padding between buttons
-        total_width = (len(tools) + len(self.color_buttons)) * (button_size + padding) - padding  # Calculate total width of the tool buttons and color buttons
-        screen_width = self.root.winfo_screenwidth()
-
-        # Position the tool buttons and color buttons in the same line
-        x_start = (screen_width - total_width) // 2
-        y = 40  # Slightly up from the top
-
-        # Add color buttons first
-        for button, color in self.color_buttons:
-            self.canvas.coords(button, x_start, y, x_start + button_size, y + button_size)
-            x_start += button_size + padding
-
-        # Add tool buttons
-        for tool, image_path in tools:
+    def add_tool_buttons(self, slots):
+        """Adds tool buttons (pen, highlighter, eraser) inside the canvas, one per slot."""
+        for (x1, y1, x2, y2), (tool, icon_name) in zip(slots, TOOL_ICONS):
             try:
-                # Load the icon image
-                icon_image = Image.open(image_path)
-                icon_image = icon_image.resize((button_size, button_size), Image.LANCZOS)
-                icon_photo = ImageTk.PhotoImage(icon_image)
+                # Pre-rendered once and shared by every overlay
+                icon_photo = assets.photo_icon(icon_name, (self.button_size, self.button_size))
 
                 # Create a rectangle around the tool button for the boundary
                 boundary = self.canvas.create_rectangle(
-                    x_start, y, x_start + button_size, y + button_size,
+                    x1, y1, x2, y2,
                     outline='black'  # Black boundary for tool buttons
                 )
 
                 # Create the button with the icon
                 button = self.canvas.create_image(
-                    x_start, y,
+                    x1, y1,
                     image=icon_photo,
                     anchor=tk.NW
                 )
@@ -137,8 +143,6 @@ class CanvasHandler:
                 # Hover effects
                 self.canvas.tag_bind(button, "<Enter>", lambda event, btn=button, t=tool: self.on_tool_hover(btn, t))
                 self.canvas.tag_bind(button, "<Leave>", lambda event, btn=button, t=tool: self.on_tool_leave(btn, t))
-
-                x_start += button_size + padding  # Move to the next tool position
             except Exception as e:
                 print(f"Error loading icon for {tool}: {e}")
 
@@ -147,13 +151,13 @@ class CanvasHandler:
         self.current_tool = tool
         if tool == 'eraser':
             self.current_color = 'grey'  # Use canvas background color as the eraser
-            self.canvas.itemconfig(self.cursor, fill='grey')  # Update the cursor to grey
+            self.pointer.set_fill('grey')  # Update the cursor to grey
         elif tool == 'pen':
             self.current_color = 'black'  # Default pen color
-            self.canvas.itemconfig(self.cursor, fill='black')  # Update the cursor to black
+            self.pointer.set_fill('black')  # Update the cursor to black
         elif tool == 'highlighter':
             self.current_color = '#39FF14'  # Neon green color for highlighter
-            self.canvas.itemconfig(self.cursor, fill='#39FF14')  # Update the cursor to neon green
+            self.pointer.set_fill('#39FF14')  # Update the cursor to neon green
 
         # Notify CameraHandler about the tool change
         if self.camera_handler:
@@ -162,8 +166,7 @@ class CanvasHandler:
     def update_virtual_cursor(self):
         """Updates the virtual cursor's appearance based on the current tool."""
         if self.camera_handler:
-            # Assuming the virtual cursor is represented by a circle on the canvas
-            self.camera_handler.canvas_handler.canvas.itemconfig(self.camera_handler.canvas_handler.cursor, fill=self.current_color)
+            self.pointer.set_fill(self.current_color)
             self.camera_handler.set_drawing_color(self.current_color)
             self.camera_handler.set_drawing_tool(self.current_tool)
 
@@ -174,8 +177,8 @@ class CanvasHandler:
         self.root.config(cursor="crosshair")
 
         # Store the current pointer color before changing
-        self.previous_color = self.canvas.itemcget(self.cursor, "fill")
-        self.canvas.itemconfig(self.cursor, fill="grey")  # Change pointer to grey while hovering
+        self.previous_color = self.pointer.fill
+        self.pointer.set_fill("grey")  # Change pointer to grey while hovering
 
     def on_leave(self, btn, color):
         print(f"Leaving: {btn}")  # Debugging
@@ -185,7 +188,7 @@ class CanvasHandler:
 
         # Restore the pointer to its previous color
         if hasattr(self, "previous_color"):
-            self.canvas.itemconfig(self.cursor, fill=self.previous_color)
+            self.pointer.set_fill(self.previous_color)
 
 
     def on_tool_hover(self, btn, tool):
@@ -195,11 +198,11 @@ class CanvasHandler:
 
         # Update the cursor to reflect the selected tool
         if tool == 'eraser':
-            self.canvas.itemconfig(self.cursor, fill='grey')
+            self.pointer.set_fill('grey')
         elif tool == 'pen':
-            self.canvas.itemconfig(self.cursor, fill='black')
+            self.pointer.set_fill('black')
         elif tool == 'highlighter':
-            self.canvas.itemconfig(self.cursor, fill='#39FF14')
+            self.pointer.set_fill('#39FF14')
         
         
 
@@ -211,7 +214,7 @@ class CanvasHandler:
     def set_color(self, color):
         """Sets the current drawing color."""
         self.current_color = color
-        self.canvas.itemconfig(self.cursor, fill=color)  # Update the cursor color
+        self.pointer.set_fill(color)  # Update the cursor color
 
         # Notify CameraHandler about the color change
         if self.camera_handler:
@@ -249,8 +252,7 @@ class CanvasHandler:
         else:
             line_width = 3  # Default width for other tools
 
-        if self.last_x and self.last_y:
-            self.canvas.create_line(self.last_x, self.last_y, x, y, fill=self.current_color, width=line_width, capstyle="round")
+        self.strokes.add_point(x, y, self.current_color, line_width, self.current_tool, capstyle="round")
 
         self.last_x, self.last_y = x, y
 
@@ -259,48 +261,53 @@ class CanvasHandler:
     def reset_last_position(self, event):
         """Resets the last drawing position."""
         self.last_x, self.last_y = None, None
+        if self.strokes:
+            self.strokes.end()
 
-    def check_pointer_over_buttons(self, x, y):
-        """Checks if the pointer is over any color or tool button and changes the color or tool accordingly."""
-        hovered = False  # Track if the pointer is over any button
-
-        # Check color buttons
+    def build_hit_index(self):
+        """Indexes the laid-out color and tool buttons for check_pointer_over_buttons."""
+        self.hit_index.clear()
+        self.hovered_button = None
         for button, color in self.color_buttons:
             coords = self.canvas.coords(button)
             if coords and len(coords) == 4:
-                x1, y1, x2, y2 = coords
-                if x1 <= x <= x2 and y1 <= y <= y2:
-                    self.set_color(color)
-                    self.on_hover(button, color)
-                    hovered = True  # Pointer is on a button
-                else:
-                    self.on_leave(button, color)  # Reset hover effect when leaving
-
-        # Check tool buttons (pen, highlighter, eraser)
+                self.hit_index.add(('color', button, color), *coords)
         for button, tool, _ in self.tool_buttons:
             coords = self.canvas.coords(button)
             if coords and len(coords) == 2:  # Image-based buttons have (x, y) coords
                 x1, y1 = coords
-                x2, y2 = x1 + 70, y1 + 70  # Assume button size is 70x70
-                if x1 <= x <= x2 and y1 <= y <= y2:
-                    self.set_tool(tool)
-                    self.on_tool_hover(button, tool)  # Visual effect when hovering
-                    hovered = True  # Pointer is on a button
-                else:
-                    self.on_tool_leave(button, tool)  # Reset hover effect when leaving
+                self.hit_index.add(('tool', button, tool), x1, y1, x1 + self.button_size, y1 + self.button_size)
 
-        # If the pointer is not over any button, reset cursor style
-        if not hovered:
-            self.canvas.config(cursor="arrow")
-            self.root.config(cursor="arrow")
-            self.root.config(cursor="arrow")
+    def check_pointer_over_buttons(self, x, y):
+        """Checks if the pointer is over any color or tool button and changes the color or tool accordingly.
+
+        Hover effects are edge-triggered: Tk is only touched when the hovered
+        button changes.
+        """
+        hit = self.hit_index.query(x, y)
+        if hit != self.hovered_button:
+            if self.hovered_button is not None:
+                kind, button, value = self.hovered_button
+                if kind == 'color':
+                    self.on_leave(button, value)  # Reset hover effect when leaving
+                else:
+                    self.on_tool_leave(button, value)
+            if hit is not None:
+                kind, button, value = hit
+                if kind == 'color':
+                    self.set_color(value)
+                    self.on_hover(button, value)
+                else:
+                    self.set_tool(value)
+                    self.on_tool_hover(button, value)  # Visual effect when hovering
+            self.hovered_button = hit
 
-        return hovered  # Return whether the pointer is over a button
+        return hit is not None  # Return whether the pointer is over a button
 
     def toggle_canvas(self):
         """Toggles the canvas overlay on and off without shifting position."""
         try:
-            if self.canvas_cooldown:
+            if not self.cooldowns.trigger('canvas', GESTURES.get('toggle_canvas').cooldown):
                 return
 
             if not self.is_canvas_active:
@@ -314,22 +321,49 @@ class CanvasHandler:
                 print("Hiding canvas overlay...")
                 self.canvas_window.withdraw()  # Hide instead of destroying
                 self.is_canvas_active = False
-
-            self.canvas_cooldown = True
-            self.root.after(2000, self.reset_canvas_cooldown)
         except Exception as e:
             print(f"Error toggling canvas: {e}")
 
+    def show_slide(self, slide):
+        """Saves the ink of the current slide and shows the ink saved for another one."""
+        if slide == self.current_slide:
+            return
+        self.save_slide_annotations()
+        self.current_slide = slide
+        if self.strokes:
+            self.strokes.clear()
+            self.load_slide_annotations()
+
+    def save_slide_annotations(self):
+        """Stores the finished strokes of the current slide."""
+        if self.strokes and self.slide_store:
+            self.strokes.end()
+            self.slide_store.put(self.current_slide, self.strokes.strokes)
+
+    def load_slide_annotations(self):
+        """Replays the stored strokes of the current slide, loading them from disk if needed."""
+        if self.strokes and self.slide_store:
+            strokes = self.slide_store.get(self.current_slide)
+            if strokes:
+                if self.annotation_backend == 'raster':
+                    self.strokes.replay(strokes)
+                else:
+                    self.strokes.replay(strokes, capstyle="round")
+
     def clear_canvas(self):
-        """Clears the canvas and destroys the overlay window."""
+        """Saves the current slide's ink, then clears the canvas and destroys the overlay window."""
         if self.canvas and self.canvas.winfo_exists():  # Check if canvas exists
+            self.save_slide_annotations()
+            self.strokes.clear()
             self.canvas.delete("all")
         if self.canvas_window:
             self.canvas_window.destroy()
         self.canvas_window = None
         self.canvas = None  # Reset the canvas reference
-        self.is_canvas_active = False   # Ensure the state is set to inactive
-
-    def reset_canvas_cooldown(self):
-        """Resets the canvas cooldown."""
-        self.canvas_cooldown = False
\ No newline at end of file
+        self.strokes = None
+        self.pointer = None
+        self.color_buttons = []  # Their canvas items are gone with the canvas
+        self.tool_buttons = []
+        self.hit_index.clear()
+        self.hovered_button = None
+        self.is_canvas_active = False   # Ensure the state is set to inactive
\ No newline at end of file
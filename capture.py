@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import deque
+import cv2
+import numpy as np
+
+
+class FrameRingBuffer:
+    """Bounded, drop-oldest buffer of preallocated frames shared by one writer and one reader."""
+
+    def __init__(self, width, height, slots=3, channels=3):
+        if slots < 3:
+            raise ValueError("FrameRingBuffer needs at least 3 slots (write, latest, in use)")
+        self.width, self.height = width, height
+        self.frames = np.zeros((slots, height, width, channels), np.uint8)
+        self.seqs = [0] * slots  # Sequence number of the frame held by each slot
+        self.timestamps = [0.0] * slots  # perf_counter() at capture time
+        self.latest_slot = None
+        self.reading_slot = None
+        self.dropped = 0  # Frames overwritten before the reader ever saw them
+        self._seq = 0
+        self._read_seq = 0
+        self._lock = threading.Lock()
+
+    def next_write_slot(self):
+        """Returns the oldest slot that is neither the latest frame nor checked out by the reader."""
+        with self._lock:
+            candidates = [
+                i for i in range(len(self.seqs))
+                if i != self.latest_slot and i != self.reading_slot
+            ]
+            slot = min(candidates, key=lambda i: self.seqs[i])
+            if self.seqs[slot] > self._read_seq:
+                self.dropped += 1
+            return slot
+
+    def commit(self, slot, captured_at):
+        """Publishes a freshly written slot as the newest frame."""
+        with self._lock:
+            self._seq += 1
+            self.seqs[slot] = self._seq
+            self.timestamps[slot] = captured_at
+            self.latest_slot = slot
+
+    def acquire_latest(self, after_seq=0):
+        """Checks out the newest frame if it is newer than after_seq.
+
+        Returns (slot, seq, captured_at) or None. The slot is protected from the
+        writer until release() is called.
+        """
+        with self._lock:
+            slot = self.latest_slot
+            if slot is None or self.seqs[slot] <= after_seq:
+                return None
+            self.reading_slot = slot
+            self._read_seq = self.seqs[slot]
+            return slot, self.seqs[slot], self.timestamps[slot]
+
+    def release(self, slot):
+        """Returns a slot checked out by acquire_latest() to the writer."""
+        with self._lock:
+            if self.reading_slot == slot:
+                self.reading_slot = None
+
+
+class LatencyStats:
+    """Rolling window of latency samples in milliseconds."""
+
+    def __init__(self, window=300):
+        self.samples = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.samples.append(seconds * 1000.0)
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self):
+        """Returns p50/p95/max of the current window."""
+        return {
+            "count": len(self.samples),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": max(self.samples) if self.samples else 0.0,
+        }
+
+
+class CaptureThread:
+    """Reads frames from a cv2.VideoCapture-like source on its own thread."""
+
+    def __init__(self, cap, width, height, slots=3):
+        self.cap = cap
+        self.buffer = FrameRingBuffer(width, height, slots)
+        self.running = False
+        self.frames_captured = 0
+        self._thread = None
+
+    def start(self):
+        """Starts the capture loop in a daemon thread."""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="CaptureThread", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stops the capture loop and waits briefly for it to exit."""
+        self.running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        buffer = self.buffer
+        size = (buffer.width, buffer.height)
+        while self.running:
+            slot = buffer.next_write_slot()
+            dst = buffer.frames[slot]
+            success, img = self.cap.read(dst)
+            captured_at = time.perf_counter()
+            if not success or img is None:
+                if getattr(self.cap, 'finished', False):
+                    break  # A replay or synthetic source ran out of frames
+                time.sleep(0.01)  # Avoid spinning when the device has no frame
+                continue
+            if img is not dst:
+                # The device ignored the requested size, scale into the preallocated slot
+                if img.shape[:2] != dst.shape[:2]:
+                    cv2.resize(img, size, dst=dst)
+                else:
+                    dst[...] = img
+            buffer.commit(slot, captured_at)
+            self.frames_captured += 1
+        self.running = False
@@ -0,0 +1,65 @@
+import threading
+import time
+
+
+class CooldownManager:
+    """Monotonic-clock cooldowns keyed by action or cooldown group.
+
+    Each key stores only a deadline, so checking is O(1) and nothing is
+    scheduled on the Tk event loop. Trigger and suppression counts are kept per
+    key for diagnostics.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.deadlines = {}
+        self.trigger_counts = {}
+        self.suppressed_counts = {}
+        self._lock = threading.Lock()
+
+    def ready(self, key):
+        """Returns True if key is not cooling down."""
+        return self.clock() >= self.deadlines.get(key, 0.0)
+
+    def remaining(self, key):
+        """Seconds left before key can fire again (0.0 when ready)."""
+        return max(0.0, self.deadlines.get(key, 0.0) - self.clock())
+
+    def trigger(self, key, duration):
+        """Starts a cooldown of duration seconds if key is ready.
+
+        Returns True if the caller may perform the action, False if it was
+        suppressed by a running cooldown.
+        """
+        with self._lock:
+            now = self.clock()
+            if now < self.deadlines.get(key, 0.0):
+                self.suppressed_counts[key] = self.suppressed_counts.get(key, 0) + 1
+                return False
+            self.deadlines[key] = now + duration
+            self.trigger_counts[key] = self.trigger_counts.get(key, 0) + 1
+            return True
+
+    def reset(self, key=None):
+        """Ends the cooldown of key, or of every key when key is None."""
+        with self._lock:
+            if key is None:
+                self.deadlines.clear()
+            else:
+                self.deadlines.pop(key, None)
+
+    def stats(self):
+        """Returns {key: {'remaining', 'triggers', 'suppressed'}} for every key seen so far."""
+        keys = set(self.deadlines) | set(self.trigger_counts) | set(self.suppressed_counts)
+        return {
+            key: {
+                'remaining': self.remaining(key),
+                'triggers': self.trigger_counts.get(key, 0),
+                'suppressed': self.suppressed_counts.get(key, 0),
+            }
+            for key in sorted(keys)
+        }
+
+
+# Shared by every CameraHandler/CanvasHandler so cooldowns survive the overlay being recreated
+shared_cooldowns = CooldownManager()
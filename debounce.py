@@ -0,0 +1,59 @@
+import numpy as np
+
+from gestures import NO_GESTURE
+
+
+class GestureDebouncer:
+    """Confirms gestures over a sliding window of per-frame classifications.
+
+    A gesture becomes active once it accounts for at least confirm of the last
+    window frames, and stays active until its count drops below release
+    (hysteresis, release < confirm). The window and per-gesture counts live in
+    preallocated arrays, so an update is O(1) apart from picking the leader.
+    """
+
+    def __init__(self, num_gestures, window=5, confirm=3, release=2):
+        if not 0 < release <= confirm <= window:
+            raise ValueError("Expected 0 < release <= confirm <= window")
+        self.window = window
+        self.confirm = confirm
+        self.release = release
+        # Slot 0 of counts is NO_GESTURE, slot i + 1 is gesture index i
+        self.history = np.full(window, NO_GESTURE, np.int16)
+        self.counts = np.zeros(num_gestures + 1, np.int16)
+        self.counts[0] = window
+        self.position = 0
+        self.active = NO_GESTURE
+        self.confirmations = 0
+        self.rejected = 0  # Frames whose classification disagreed with the window
+
+    def update(self, gesture_index):
+        """Adds one frame's classification and returns the active gesture index (or NO_GESTURE)."""
+        oldest = self.history[self.position]
+        self.counts[oldest + 1] -= 1
+        self.history[self.position] = gesture_index
+        self.counts[gesture_index + 1] += 1
+        self.position = (self.position + 1) % self.window
+
+        if self.active != NO_GESTURE and self.counts[self.active + 1] >= self.release:
+            if gesture_index != self.active:
+                self.rejected += 1
+            return self.active
+
+        leader = int(np.argmax(self.counts[1:]))
+        if self.counts[leader + 1] >= self.confirm:
+            if leader != self.active:
+                self.confirmations += 1
+            self.active = leader
+        else:
+            if gesture_index != NO_GESTURE:
+                self.rejected += 1
+            self.active = NO_GESTURE
+        return self.active
+
+    def reset(self):
+        self.history[:] = NO_GESTURE
+        self.counts[:] = 0
+        self.counts[0] = self.window
+        self.position = 0
+        self.active = NO_GESTURE
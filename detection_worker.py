@@ -0,0 +1,203 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import time
+import cv2
+import numpy as np
+
+# Layout of the int32 result block written by the worker.
+# The first word is a sequence lock: odd while the worker is writing.
+RES_LOCK = 0
+RES_FRAME_SEQ = 1
+RES_PRESENT = 2
+RES_HAND_TYPE = 3  # 1 = Right, 0 = Left
+RES_FINGERS = 4  # 5 words
+RES_BBOX = 9  # x, y, w, h
+RES_CENTER = 13  # cx, cy
+RES_DETECT_US = 15  # Inference time in microseconds
+RES_LANDMARKS = 16  # 21 x (x, y, z)
+RESULT_WORDS = RES_LANDMARKS + 21 * 3
+
+# Control words shared under the engine lock
+CTRL_PENDING_SLOT = 0  # Slot holding the newest unprocessed frame, -1 if none
+CTRL_PENDING_SEQ = 1
+CTRL_BUSY_SLOT = 2  # Slot the worker is currently reading, -1 if idle
+
+
+def _worker_main(frame_name, result_name, shape, control, lock, frame_ready, stop_event, detection_con, max_hands):
+    """Entry point of the detection process: runs cvzone/MediaPipe on frames from shared memory."""
+    from cvzone.HandTrackingModule import HandDetector
+
+    # Tracking mode: MediaPipe follows the hand between frames and only runs palm detection when it loses it
+    detector = HandDetector(detectionCon=detection_con, maxHands=max_hands)
+    frame_shm = shared_memory.SharedMemory(name=frame_name)
+    result_shm = shared_memory.SharedMemory(name=result_name)
+    frames = np.ndarray(shape, np.uint8, buffer=frame_shm.buf)
+    result = np.ndarray((RESULT_WORDS,), np.int32, buffer=result_shm.buf)
+
+    try:
+        while not stop_event.is_set():
+            if not frame_ready.wait(0.1):
+                continue
+            with lock:
+                frame_ready.clear()
+                slot = control[CTRL_PENDING_SLOT]
+                frame_seq = control[CTRL_PENDING_SEQ]
+                control[CTRL_PENDING_SLOT] = -1
+                control[CTRL_BUSY_SLOT] = slot
+            if slot < 0:
+                continue
+
+            start = time.perf_counter()
+            hands = detector.findHands(frames[slot], draw=False)
+            hand = hands[0] if hands else None
+            fingers = detector.fingersUp(hand) if hand else None
+            detect_us = int((time.perf_counter() - start) * 1e6)
+
+            with lock:
+                control[CTRL_BUSY_SLOT] = -1
+
+            result[RES_LOCK] += 1  # Odd: write in progress
+            result[RES_FRAME_SEQ] = frame_seq
+            result[RES_DETECT_US] = detect_us
+            if hand:
+                result[RES_PRESENT] = 1
+                result[RES_HAND_TYPE] = 1 if hand['type'] == 'Right' else 0
+                result[RES_FINGERS:RES_FINGERS + 5] = fingers
+                result[RES_BBOX:RES_BBOX + 4] = hand['bbox']
+                result[RES_CENTER:RES_CENTER + 2] = hand['center']
+                result[RES_LANDMARKS:] = np.asarray(hand['lmList'], np.int32).reshape(-1)[:21 * 3]
+            else:
+                result[RES_PRESENT] = 0
+            result[RES_LOCK] += 1  # Even: result is consistent
+    finally:
+        frame_shm.close()
+        result_shm.close()
+
+
+class DetectionEngine:
+    """Runs hand detection in a child process with shared-memory frame and result handoff."""
+
+    def __init__(self, width, height, slots=3, detection_con=0.7, max_hands=1):
+        if slots < 3:
+            raise ValueError("DetectionEngine needs at least 3 frame slots")
+        self.width, self.height = width, height
+        self.shape = (slots, height, width, 3)
+        self.detection_con = detection_con
+        self.max_hands = max_hands
+        self.process = None
+        self.frame_seq = 0
+        self.last_detect_ms = 0.0
+        self._ctx = mp.get_context("spawn")
+        self._frame_shm = None
+        self._result_shm = None
+
+    def start(self):
+        """Allocates the shared memory blocks and starts the worker process."""
+        if self.process is not None:
+            return
+        frame_bytes = int(np.prod(self.shape))
+        self._frame_shm = shared_memory.SharedMemory(create=True, size=frame_bytes)
+        self._result_shm = shared_memory.SharedMemory(create=True, size=RESULT_WORDS * 4)
+        self.frames = np.ndarray(self.shape, np.uint8, buffer=self._frame_shm.buf)
+        self.result = np.ndarray((RESULT_WORDS,), np.int32, buffer=self._result_shm.buf)
+        self.result[:] = 0
+        self._result_copy = np.zeros(RESULT_WORDS, np.int32)
+
+        self.control = self._ctx.Array('i', [-1, 0, -1], lock=False)
+        self.lock = self._ctx.Lock()
+        self.frame_ready = self._ctx.Event()
+        self.stop_event = self._ctx.Event()
+        self.process = self._ctx.Process(
+            target=_worker_main,
+            args=(self._frame_shm.name, self._result_shm.name, self.shape, self.control,
+                  self.lock, self.frame_ready, self.stop_event, self.detection_con, self.max_hands),
+            name="HandDetection",
+            daemon=True,
+        )
+        self.process.start()
+
+    def stop(self, timeout=1.0):
+        """Stops the worker and releases the shared memory."""
+        if self.process is None:
+            return
+        self.stop_event.set()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        # Drop our views before closing the buffers they point into
+        self.frames = self.result = None
+        for shm in (self._frame_shm, self._result_shm):
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._frame_shm = self._result_shm = None
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def submit(self, img):
+        """Copies a frame into a free slot and hands it to the worker. Never blocks on inference."""
+        with self.lock:
+            pending = self.control[CTRL_PENDING_SLOT]
+            busy = self.control[CTRL_BUSY_SLOT]
+        # With three slots there is always one that is neither queued nor being read
+        slot = next(i for i in range(self.shape[0]) if i != pending and i != busy)
+        if img.shape[:2] == (self.height, self.width):
+            self.frames[slot][...] = img
+        else:
+            cv2.resize(img, (self.width, self.height), dst=self.frames[slot])
+
+        self.frame_seq += 1
+        with self.lock:
+            # Replacing an unread pending frame drops it, the worker only wants the newest
+            self.control[CTRL_PENDING_SLOT] = slot
+            self.control[CTRL_PENDING_SEQ] = self.frame_seq
+            self.frame_ready.set()
+        return self.frame_seq
+
+    def latest_result(self, after_seq=0):
+        """Returns (frame_seq, hands) for the newest result newer than after_seq, else None.
+
+        hands mirrors cvzone's findHands output with an extra 'fingers' entry.
+        """
+        result = self._read_result()
+        if result is None:
+            return None
+        frame_seq = int(result[RES_FRAME_SEQ])
+        if frame_seq <= after_seq:
+            return None
+        self.last_detect_ms = result[RES_DETECT_US] / 1000.0
+        if not result[RES_PRESENT]:
+            return frame_seq, []
+        x, y, w, h = (int(v) for v in result[RES_BBOX:RES_BBOX + 4])
+        hand = {
+            'lmList': result[RES_LANDMARKS:].reshape(21, 3).tolist(),
+            'bbox': (x, y, w, h),
+            'center': (int(result[RES_CENTER]), int(result[RES_CENTER + 1])),
+            'type': 'Right' if result[RES_HAND_TYPE] else 'Left',
+            'fingers': result[RES_FINGERS:RES_FINGERS + 5].tolist(),
+        }
+        return frame_seq, [hand]
+
+    def _read_result(self, retries=5):
+        """Copies the result block out of shared memory using the sequence lock."""
+        for _ in range(retries):
+            before = int(self.result[RES_LOCK])
+            if before % 2:
+                continue
+            self._result_copy[:] = self.result
+            if int(self.result[RES_LOCK]) == before:
+                return self._result_copy
+        return None
+
+
+def draw_hand(img, hand, color=(255, 0, 255)):
+    """Draws landmarks and the bounding box of a hand returned by DetectionEngine."""
+    for x, y, _ in hand['lmList']:
+        cv2.circle(img, (x, y), 3, color, cv2.FILLED)
+    x, y, w, h = hand['bbox']
+    cv2.rectangle(img, (x - 20, y - 20), (x + w + 20, y + h + 20), color, 2)
+    return img
@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+
+class DisplaySink:
+    """Shows BGR frames in a Tk label through one persistent PhotoImage.
+
+    Frames are converted into a preallocated RGBA array that a PIL image wraps
+    without copying (Pillow only shares memory for 4-byte modes like RGBA; an
+    RGB frombuffer would be a private copy), and the PhotoImage is updated in place with paste(), so
+    no per-frame PIL or Tk images are allocated. Must be created and used on
+    the Tk thread.
+    """
+
+    def __init__(self, label, width, height, visibility_check_every=15):
+        self.label = label
+        self.width, self.height = width, height
+        self.rgb = np.zeros((height, width, 4), np.uint8)
+        self._scaled = np.zeros((height, width, 3), np.uint8)
+        # frombuffer with the raw decoder shares memory with self.rgb (RGBA only)
+        self.image = Image.frombuffer('RGBA', (width, height), self.rgb, 'raw', 'RGBA', 0, 1)
+        self.photo = ImageTk.PhotoImage(image=self.image)
+        self.label.img_tk = self.photo  # Keep a reference so Tk does not drop the image
+        self.label.config(image=self.photo)
+        self.visibility_check_every = visibility_check_every
+        self.frames_shown = 0
+        self.frames_skipped = 0
+        self._visible = True
+        self._until_check = 0
+
+    def is_visible(self):
+        """Whether the preview can be seen; queried from Tk only every few frames."""
+        if self._until_check > 0:
+            self._until_check -= 1
+            return self._visible
+        self._until_check = self.visibility_check_every
+        try:
+            window = self.label.winfo_toplevel()
+            self._visible = bool(self.label.winfo_ismapped()) and window.state() not in ('iconic', 'withdrawn')
+        except Exception:
+            self._visible = False  # The window is being destroyed
+        return self._visible
+
+    def show(self, bgr):
+        """Updates the preview from a BGR frame. Returns False if the refresh was skipped."""
+        if not self.is_visible():
+            self.frames_skipped += 1
+            return False
+        if bgr.shape[:2] != (self.height, self.width):
+            bgr = cv2.resize(bgr, (self.width, self.height), dst=self._scaled)
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2RGBA, dst=self.rgb)
+        self.photo.paste(self.image)
+        self.frames_shown += 1
+        return True
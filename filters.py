@@ -0,0 +1,173 @@
+"""Landmark smoothing filters that run over all 21 hand landmarks at once.
+
+Both filters work element-wise on arrays of any shape, typically (21, 3)
+cvzone landmark lists in camera pixels, and take monotonic timestamps in
+seconds. Run this module on a recorded session to compare presets:
+
+    python filters.py session.npz
+
+where session.npz holds 'landmarks' (T, 21, 3) and 'timestamps' (T,).
+"""
+import sys
+import numpy as np
+
+
+class OneEuroFilter:
+    """Vectorized One Euro filter (Casiez et al.): low lag when moving, low jitter when still."""
+
+    def __init__(self, min_cutoff=1.0, beta=0.01, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.dx = None
+        self.t = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, t):
+        x = np.asarray(x, np.float32)
+        if self.x is None or self.t is None or t <= self.t:
+            self.x = x.copy()
+            self.dx = np.zeros_like(x)
+            self.t = t
+            return self.x.copy()
+
+        dt = t - self.t
+        dx = (x - self.x) / dt
+        self.dx += self._alpha(self.d_cutoff, dt) * (dx - self.dx)
+        cutoff = self.min_cutoff + self.beta * np.abs(self.dx)
+        self.x += self._alpha(cutoff, dt) * (x - self.x)
+        self.t = t
+        return self.x.copy()
+
+
+class ConstantVelocityKalman:
+    """Vectorized constant-velocity Kalman filter, one independent [position, velocity] state per element.
+
+    process_noise is the white-acceleration spectral density and
+    measurement_noise the variance of a landmark measurement, both in
+    camera pixels.
+    """
+
+    def __init__(self, process_noise=500.0, measurement_noise=4.0):
+        self.q = process_noise
+        self.r = measurement_noise
+        self.reset()
+
+    def reset(self):
+        self.p = None
+        self.t = None
+
+    def __call__(self, z, t):
+        z = np.asarray(z, np.float32)
+        if self.p is None or self.t is None or t <= self.t:
+            self.p = z.copy()
+            self.v = np.zeros_like(z)
+            self.P00 = np.full_like(z, self.r)
+            self.P01 = np.zeros_like(z)
+            self.P11 = np.full_like(z, self.q)
+            self.t = t
+            return self.p.copy()
+
+        dt = t - self.t
+        q = self.q
+        # Predict
+        self.p += self.v * dt
+        self.P00 += dt * (2 * self.P01 + dt * self.P11) + q * dt ** 3 / 3
+        self.P01 += dt * self.P11 + q * dt ** 2 / 2
+        self.P11 += q * dt
+
+        # Update
+        s = self.P00 + self.r
+        k0 = self.P00 / s
+        k1 = self.P01 / s
+        residual = z - self.p
+        self.p += k0 * residual
+        self.v += k1 * residual
+        self.P11 -= k1 * self.P01
+        self.P00 *= 1 - k0
+        self.P01 *= 1 - k0
+        self.t = t
+        return self.p.copy()
+
+
+class PassThroughFilter:
+    """No smoothing; same interface as the real filters."""
+
+    def reset(self):
+        pass
+
+    def __call__(self, x, t):
+        return np.asarray(x, np.float32)
+
+
+# Latency/smoothness presets, from least to most smoothing
+PRESETS = {
+    'off': (PassThroughFilter, {}),
+    'responsive': (OneEuroFilter, {'min_cutoff': 1.5, 'beta': 0.05}),
+    'balanced': (OneEuroFilter, {'min_cutoff': 1.0, 'beta': 0.01}),
+    'smooth': (OneEuroFilter, {'min_cutoff': 0.4, 'beta': 0.005}),
+    'kalman': (ConstantVelocityKalman, {'process_noise': 500.0, 'measurement_noise': 4.0}),
+    'kalman_smooth': (ConstantVelocityKalman, {'process_noise': 100.0, 'measurement_noise': 9.0}),
+}
+
+
+def make_filter(preset='balanced', **overrides):
+    """Builds a filter from a preset name, with optional parameter overrides."""
+    cls, params = PRESETS[preset]
+    return cls(**{**params, **overrides})
+
+
+def replay(landmark_filter, landmarks, timestamps):
+    """Runs a filter over a recorded (T, ...) landmark sequence and returns the filtered sequence."""
+    landmark_filter.reset()
+    out = np.empty(np.shape(landmarks), np.float32)
+    for i, (frame, t) in enumerate(zip(landmarks, timestamps)):
+        out[i] = landmark_filter(frame, t)
+    return out
+
+
+def evaluate(raw, filtered):
+    """Scores a filtered sequence against the raw one.
+
+    jitter is the mean magnitude of the second difference (lower is
+    smoother), lag the mean distance from the raw positions (lower is more
+    responsive). Both are in camera pixels over the x/y coordinates.
+    """
+    raw = np.asarray(raw, np.float32)[..., :2]
+    filtered = np.asarray(filtered, np.float32)[..., :2]
+    jitter = np.linalg.norm(np.diff(filtered, 2, axis=0), axis=-1).mean() if len(filtered) > 2 else 0.0
+    lag = np.linalg.norm(filtered - raw, axis=-1).mean()
+    return {'jitter_px': float(jitter), 'lag_px': float(lag)}
+
+
+def tune(landmarks, timestamps, presets=None):
+    """Replays every preset over a recording and returns {preset: evaluate() result}."""
+    results = {}
+    for name in presets or PRESETS:
+        filtered = replay(make_filter(name), landmarks, timestamps)
+        results[name] = evaluate(landmarks, filtered)
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print(__doc__)
+        return
+    session = np.load(argv[0])
+    results = tune(session['landmarks'], session['timestamps'])
+    print(f"{'preset':<14} {'jitter px':>10} {'lag px':>8}")
+    for name, scores in results.items():
+        print(f"{name:<14} {scores['jitter_px']:>10.3f} {scores['lag_px']:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
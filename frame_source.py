@@ -0,0 +1,219 @@
+import glob
+import os
+import time
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class FrameSource:
+    """Minimal cv2.VideoCapture-compatible interface shared by all frame sources."""
+
+    finished = False  # True once a finite source has no more frames
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        raise NotImplementedError
+
+    def set(self, prop, value):
+        return False
+
+    def get(self, prop):
+        return 0.0
+
+    def release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    """Live webcam capture."""
+
+    def __init__(self, index=0):
+        self.cap = cv2.VideoCapture(index)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self, image=None):
+        return self.cap.read(image)
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        self.cap.release()
+
+
+class ReplaySource(FrameSource):
+    """Replays a video file, an image directory or a glob of images.
+
+    With realtime=True frames are paced at fps (the file's own rate if not
+    given), otherwise they are returned as fast as they can be decoded.
+    """
+
+    def __init__(self, path, realtime=False, fps=None, loop=False):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.frame_index = 0
+        self.images = None
+        self.cap = None
+
+        if os.path.isdir(path):
+            self.images = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+        elif any(ch in path for ch in '*?['):
+            self.images = sorted(glob.glob(path))
+        else:
+            self.cap = cv2.VideoCapture(path)
+
+        if fps is None:
+            fps = self.cap.get(cv2.CAP_PROP_FPS) if self.cap is not None else 0
+        self.fps = fps or 30.0
+        self._started_at = None
+        self._paced_frames = 0
+
+    def isOpened(self):
+        if self.images is not None:
+            return len(self.images) > 0
+        return self.cap.isOpened()
+
+    def read(self, image=None):
+        if self.finished:
+            return False, None
+        self._pace()
+
+        if self.images is not None:
+            if self.frame_index >= len(self.images):
+                if not self.loop:
+                    self.finished = True
+                    return False, None
+                self.frame_index = 0
+            img = cv2.imread(self.images[self.frame_index])
+            success = img is not None
+        else:
+            success, img = self.cap.read(image)
+            if not success and self.loop:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                success, img = self.cap.read(image)
+            if not success:
+                self.finished = True
+
+        self.frame_index += 1
+        return success, img
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if self.cap is not None:
+            return self.cap.get(prop)
+        return 0.0
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+    def _pace(self):
+        """Sleeps until the current frame is due when replaying in real time."""
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._started_at is None:
+            self._started_at = now
+            return
+        self._paced_frames += 1
+        due = self._started_at + self._paced_frames / self.fps
+        if due > now:
+            time.sleep(due - now)
+
+
+class SyntheticSource(FrameSource):
+    """Generates frames with a moving skin-coloured blob, no hardware or files needed."""
+
+    def __init__(self, width=300, height=200, fps=None, frames=None, seed=0):
+        self.width, self.height = width, height
+        self.fps = fps  # None means unpaced
+        self.frames = frames  # None means endless
+        self.frame_index = 0
+        rng = np.random.default_rng(seed)
+        # Static noisy background so colour conversion and detection see realistic data
+        self.background = rng.integers(40, 90, (height, width, 3), dtype=np.uint8)
+        self._started_at = None
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self.width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self.height = int(value)
+        else:
+            return False
+        if self.background.shape[:2] != (self.height, self.width):
+            self.background = cv2.resize(self.background, (self.width, self.height))
+        return True
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps or 0)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        return 0.0
+
+    def read(self, image=None):
+        if self.frames is not None and self.frame_index >= self.frames:
+            self.finished = True
+            return False, None
+        if self.fps:
+            now = time.perf_counter()
+            if self._started_at is None:
+                self._started_at = now
+            due = self._started_at + self.frame_index / self.fps
+            if due > now:
+                time.sleep(due - now)
+
+        if image is None or image.shape != self.background.shape:
+            image = np.empty_like(self.background)
+        image[...] = self.background
+
+        # Move the blob along a Lissajous path so consecutive frames differ
+        t = self.frame_index / 30.0
+        cx = int(self.width * (0.5 + 0.35 * np.sin(t * 1.3)))
+        cy = int(self.height * (0.5 + 0.35 * np.sin(t * 0.7)))
+        radius = max(4, min(self.width, self.height) // 8)
+        cv2.circle(image, (cx, cy), radius, (120, 160, 210), cv2.FILLED)
+
+        self.frame_index += 1
+        return True, image
+
+
+def open_source(spec=None, **kwargs):
+    """Opens a frame source from a spec.
+
+    spec may be None or an int (camera index), a FrameSource (returned as is),
+    'camera:<index>', 'synthetic', 'replay:<path>' or a bare file/directory path.
+    Extra keyword arguments go to the source constructor.
+    """
+    if spec is None:
+        return CameraSource(0)
+    if isinstance(spec, FrameSource):
+        return spec
+    if isinstance(spec, int):
+        return CameraSource(spec)
+
+    kind, _, arg = spec.partition(':')
+    if kind == 'camera':
+        return CameraSource(int(arg or 0))
+    if kind == 'synthetic':
+        return SyntheticSource(**kwargs)
+    if kind == 'replay':
+        return ReplaySource(arg, **kwargs)
+    return ReplaySource(spec, **kwargs)
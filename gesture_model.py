@@ -0,0 +1,224 @@
+import os
+import threading
+from collections import OrderedDict, deque
+
+import cv2
+import numpy as np
+
+from gestures import GESTURES
+
+GESTURE_MODEL_ENV_VAR = "AIR_TRACKER_GESTURE_MODEL"  # 'landmarks' or 'crop' turns the model path on
+GESTURE_LABELS_ENV_VAR = "AIR_TRACKER_GESTURE_LABELS"  # Labels file, overrides the model's own labels
+CROP_SIZE = 64
+
+
+def load_labels(path):
+    """Reads a labels file: one gesture name per line, in the model's class index order."""
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def landmark_vector(lm_list):
+    """Flattens 21 (x, y, z) landmarks to a 63-float32 vector, relative to the wrist and scale-free."""
+    points = np.asarray(lm_list, np.float32)[:21, :3]
+    points = points - points[0]
+    scale = np.abs(points[:, :2]).max()
+    if scale > 0:
+        points /= scale
+    return points.reshape(-1)
+
+
+def preprocess_crop(img, bbox, size=CROP_SIZE):
+    """Crops the hand box out of a BGR frame as a size x size RGB float32 image in [0, 1]."""
+    x, y, w, h = bbox
+    height, width = img.shape[:2]
+    x0, y0 = max(int(x), 0), max(int(y), 0)
+    x1, y1 = min(int(x + w), width), min(int(y + h), height)
+    if x1 <= x0 or y1 <= y0:
+        return np.zeros((size, size, 3), np.float32)
+    crop = cv2.resize(img[y0:y1, x0:x1], (size, size), interpolation=cv2.INTER_AREA)
+    crop = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+    return crop.astype(np.float32) * np.float32(1.0 / 255.0)
+
+
+class GestureInference:
+    """Runs the Keras gesture model off the Tk thread in micro-batches.
+
+    submit() queues a hand's input (a landmark vector or a float32 crop,
+    depending on input_kind) under its frame ID and returns at once. A worker
+    thread predicts up to max_batch queued inputs per model call, waiting at
+    most max_wait seconds to fill a batch. classify() merges the newest result
+    no more than max_age frames old into the frame being handled, and falls
+    back to the fingersUp lookup table when there is no confident result, for
+    example while the model is still loading or when it is unavailable.
+    Class indices are mapped to gestures with labels, taken from the model
+    (its manifest or labels.txt, see ModelManager.labels) when not given.
+    Labels that name no registered gesture (e.g. a "none" class) mean no
+    gesture. A model without labels, or whose input shape doesn't match
+    input_kind, disables inference for good, leaving fingersUp in charge.
+    """
+
+    def __init__(self, manager, input_kind='landmarks', labels=None, max_batch=8, max_wait=0.005,
+                 min_confidence=0.8, max_age=3, queue_size=16):
+        self.manager = manager
+        self.input_kind = input_kind
+        self.labels = labels
+        self.gestures = []  # Index -> Gesture, or None for labels that aren't registered gestures
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.min_confidence = min_confidence
+        self.max_age = max_age
+        self.queue = deque(maxlen=queue_size)  # Oldest inputs are dropped if the model falls behind
+        self.results = OrderedDict()  # frame id -> (class index, confidence)
+        self.batches = 0
+        self.inferred = 0
+        self.fallbacks = 0
+        self.enabled = True
+        self._checked = False
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="gesture-inference", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def submit(self, frame_id, hand, img=None):
+        """Queues one hand for inference. Never blocks on the model."""
+        if not self.enabled:
+            return
+        if self.input_kind == 'crop':
+            x = preprocess_crop(img, hand['bbox'])
+        else:
+            x = landmark_vector(hand['lmList'])
+        with self._cond:
+            self.queue.append((frame_id, x))
+            self._cond.notify()
+
+    def classify(self, frame_id, fingers):
+        """Returns the Gesture for a frame: the model's if it has a fresh confident result, else fingersUp's."""
+        with self._cond:
+            for result_id in reversed(self.results):
+                if result_id > frame_id:
+                    continue
+                if frame_id - result_id > self.max_age:
+                    break
+                index, confidence = self.results[result_id]
+                if confidence >= self.min_confidence and index < len(self.gestures):
+                    return self.gestures[index]
+                break
+        self.fallbacks += 1
+        return GESTURES.classify(fingers)
+
+    @staticmethod
+    def _gesture(name):
+        try:
+            return GESTURES.get(name) if name else None
+        except KeyError:
+            return None
+
+    def expected_shape(self):
+        """Shape of one input, without the batch dimension."""
+        if self.input_kind == 'crop':
+            return (CROP_SIZE, CROP_SIZE, 3)
+        return (63,)
+
+    def _check_model(self, model):
+        """Whether the model takes our inputs and has labels for its outputs; sets up the label mapping.
+
+        Shapes the model doesn't report are trusted.
+        """
+        input_shape = getattr(model, 'input_shape', None)
+        if input_shape is not None:
+            shape = tuple(input_shape[1:])
+            expected = self.expected_shape()
+            if len(shape) != len(expected) or any(dim not in (None, want) for dim, want in zip(shape, expected)):
+                print(f"Gesture model expects inputs of shape {shape}, not {self.input_kind} {expected}; "
+                      f"using fingersUp only")
+                return False
+
+        labels = self.labels
+        if labels is None and hasattr(self.manager, 'labels'):
+            labels = self.manager.labels()
+        if not labels:
+            print("Gesture model has no labels (add them to its manifest or a labels.txt); using fingersUp only")
+            return False
+        output_shape = getattr(model, 'output_shape', None)
+        if output_shape is not None and output_shape[-1] not in (None, len(labels)):
+            print(f"Gesture model has {output_shape[-1]} classes but {len(labels)} labels; using fingersUp only")
+            return False
+        with self._cond:
+            self.labels = list(labels)
+            self.gestures = [self._gesture(name) for name in self.labels]
+        return True
+
+    def _next_batch(self):
+        with self._cond:
+            while self._running and not self.queue:
+                self._cond.wait()
+            if not self._running:
+                return None
+            if len(self.queue) < self.max_batch:
+                self._cond.wait(self.max_wait)  # Give the next frames a moment to join the batch
+            count = min(len(self.queue), self.max_batch)
+            return [self.queue.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            # Loads the model on this thread the first time; None while unavailable
+            model = self.manager.get(timeout=0)
+            if model is None:
+                continue
+            if not self._checked:
+                self._checked = True
+                if not self._check_model(model):
+                    with self._cond:
+                        self.enabled = False
+                        self.queue.clear()
+                    return
+            try:
+                inputs = np.stack([x for _, x in batch])
+                probabilities = np.asarray(model(inputs, training=False))
+            except Exception as e:
+                print(f"Error running gesture model: {e}")
+                continue
+
+            indices = probabilities.argmax(axis=1)
+            confidences = probabilities[np.arange(len(batch)), indices]
+            with self._cond:
+                for (frame_id, _), index, confidence in zip(batch, indices, confidences):
+                    self.results[frame_id] = (int(index), float(confidence))
+                while len(self.results) > 64:
+                    self.results.popitem(last=False)
+            self.batches += 1
+            self.inferred += len(batch)
+
+
+def inference_from_env(manager):
+    """Builds a GestureInference if $AIR_TRACKER_GESTURE_MODEL names an input kind, else None."""
+    input_kind = os.environ.get(GESTURE_MODEL_ENV_VAR, "").lower()
+    if input_kind not in ('landmarks', 'crop'):
+        return None
+    labels = None
+    labels_path = os.environ.get(GESTURE_LABELS_ENV_VAR)
+    if labels_path:
+        try:
+            labels = load_labels(labels_path)
+        except OSError as e:
+            print(f"Error loading gesture labels: {e}")
+            return None
+    return GestureInference(manager, input_kind, labels)
@@ -0,0 +1,120 @@
+import numpy as np
+
+TIP_IDS = [4, 8, 12, 16, 20]  # Thumb, index, middle, ring, pinky tips
+FINGER_BITS = np.array([1 << i for i in range(5)], np.int32)
+NO_GESTURE = -1
+
+
+def fingers_to_mask(fingers):
+    """Packs a 5-finger state ([thumb, index, middle, ring, pinky]) into a bitmask."""
+    mask = 0
+    for bit, up in enumerate(fingers):
+        if up:
+            mask |= 1 << bit
+    return mask
+
+
+def fingers_up_batch(landmarks, right_hand):
+    """Vectorized cvzone fingersUp over a batch of hands.
+
+    landmarks is an (N, 21, 2+) array of pixel coordinates and right_hand an
+    (N,) boolean array. Returns an (N, 5) uint8 array of finger states.
+    """
+    landmarks = np.asarray(landmarks)
+    right_hand = np.asarray(right_hand, bool)
+    fingers = np.empty((landmarks.shape[0], 5), np.uint8)
+
+    thumb_tip = landmarks[:, TIP_IDS[0], 0]
+    thumb_ip = landmarks[:, TIP_IDS[0] - 1, 0]
+    fingers[:, 0] = np.where(right_hand, thumb_tip > thumb_ip, thumb_tip < thumb_ip)
+
+    tips = np.array(TIP_IDS[1:])
+    fingers[:, 1:] = landmarks[:, tips, 1] < landmarks[:, tips - 2, 1]
+    return fingers
+
+
+class Gesture:
+    """A finger pattern and what it triggers.
+
+    action names the handler method (or function) to call, cooldown is in
+    seconds and gestures sharing a cooldown_group also share the cooldown.
+    Continuous gestures (drawing, pointing) act on every frame and have no
+    cooldown. When two gestures use the same pattern the higher priority wins.
+    """
+
+    def __init__(self, name, fingers, action, cooldown=0.0, cooldown_group=None, priority=0,
+                 continuous=False, label=None):
+        self.name = name
+        self.fingers = list(fingers)
+        self.mask = fingers_to_mask(fingers)
+        self.action = action
+        self.cooldown = cooldown
+        self.cooldown_group = cooldown_group or name
+        self.priority = priority
+        self.continuous = continuous
+        self.label = label or name.replace('_', ' ').title()
+        self.index = NO_GESTURE  # Position in the registry, set by register()
+
+    def __repr__(self):
+        return f"Gesture({self.name!r}, {self.fingers})"
+
+
+class GestureRegistry:
+    """Maps every 5-finger bitmask to at most one gesture through a 32-entry lookup table."""
+
+    def __init__(self, gestures=()):
+        self.gestures = []
+        self.table = [None] * 32
+        self.index_table = np.full(32, NO_GESTURE, np.int16)  # Mask -> index into gestures
+        for gesture in gestures:
+            self.register(gesture)
+
+    def register(self, gesture):
+        """Adds a gesture, replacing a lower-priority one with the same pattern."""
+        current = self.table[gesture.mask]
+        if current is not None and current.priority >= gesture.priority:
+            raise ValueError(f"{gesture.name} conflicts with {current.name} for pattern {gesture.fingers}")
+        gesture.index = len(self.gestures)
+        self.gestures.append(gesture)
+        self.table[gesture.mask] = gesture
+        self.index_table[gesture.mask] = gesture.index
+        return gesture
+
+    def get(self, name):
+        for gesture in self.gestures:
+            if gesture.name == name:
+                return gesture
+        raise KeyError(name)
+
+    def classify(self, fingers):
+        """Returns the Gesture for a fingersUp list, or None."""
+        return self.table[fingers_to_mask(fingers)]
+
+    def classify_mask(self, mask):
+        return self.table[mask]
+
+    def classify_fingers_batch(self, fingers):
+        """Returns gesture indices (NO_GESTURE where none) for an (N, 5) array of finger states."""
+        masks = np.asarray(fingers, np.int32) @ FINGER_BITS
+        return self.index_table[masks]
+
+    def classify_batch(self, landmarks, right_hand):
+        """Classifies an (N, 21, 2+) batch of landmark arrays, e.g. from a recorded session."""
+        return self.classify_fingers_batch(fingers_up_batch(landmarks, right_hand))
+
+
+# The single gesture table shared by camera.py and new.py
+GESTURES = GestureRegistry([
+    Gesture('toggle_canvas', [0, 1, 0, 0, 1], 'toggle_canvas', cooldown=2.0, cooldown_group='canvas', priority=10),
+    Gesture('draw', [0, 1, 0, 0, 0], 'draw', continuous=True, priority=9),
+    Gesture('pointer', [0, 1, 1, 0, 0], 'pointer', continuous=True, priority=9),
+    Gesture('toggle_video', [1, 1, 0, 0, 0], 'click_video', cooldown=2.0, cooldown_group='video_toggle', priority=8),
+    Gesture('enter', [0, 0, 1, 1, 1], 'trigger_enter_key', cooldown=1.0, priority=7, label='Press Enter'),
+    Gesture('slide_backward', [1, 0, 0, 0, 0], 'move_slide_backward', cooldown=1.0, cooldown_group='slide_toggle',
+            priority=6, label='Move Slide Backward'),
+    Gesture('slide_forward', [0, 0, 0, 0, 1], 'move_slide_forward', cooldown=1.0, cooldown_group='slide_toggle',
+            priority=6, label='Move Slide Forward'),
+    Gesture('zoom_in', [0, 1, 1, 1, 0], 'trigger_zoom_in', cooldown=1.5, priority=5),
+    Gesture('zoom_out', [0, 1, 1, 1, 1], 'trigger_zoom_out', cooldown=1.5, priority=5),
+    Gesture('close', [1, 0, 0, 0, 1], 'close_application', cooldown=2.0, priority=4, label='Close Application'),
+])
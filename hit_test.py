@@ -0,0 +1,34 @@
+class GridHitIndex:
+    """Uniform-grid index of axis-aligned rectangles for point hit-testing.
+
+    Built once when the toolbar is laid out. A query looks at the single grid
+    cell under the point and the few rectangles registered in it, instead of
+    every button.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.rects = []  # (x1, y1, x2, y2, key)
+        self.cells = {}  # (col, row) -> indices into rects
+
+    def add(self, key, x1, y1, x2, y2):
+        """Registers a rectangle (inclusive bounds) under key."""
+        index = len(self.rects)
+        self.rects.append((x1, y1, x2, y2, key))
+        size = self.cell_size
+        for row in range(int(y1) // size, int(y2) // size + 1):
+            for col in range(int(x1) // size, int(x2) // size + 1):
+                self.cells.setdefault((col, row), []).append(index)
+
+    def query(self, x, y):
+        """Returns the key of the first rectangle containing (x, y), or None."""
+        size = self.cell_size
+        for index in self.cells.get((int(x) // size, int(y) // size), ()):
+            x1, y1, x2, y2, key = self.rects[index]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                return key
+        return None
+
+    def clear(self):
+        self.rects = []
+        self.cells = {}
@@ -0,0 +1,83 @@
+import os
+import time
+
+INPUT_ENV_VAR = "AIR_TRACKER_INPUT"
+
+
+class InputBackend:
+    """Where gesture actions send their keystrokes and mouse events.
+
+    Method names and arguments follow pyautogui so actions read the same.
+    """
+
+    def press(self, key):
+        self._send('press', key)
+
+    def hotkey(self, *keys):
+        self._send('hotkey', *keys)
+
+    def moveTo(self, x, y):
+        self._send('moveTo', x, y)
+
+    def mouseDown(self, button='left'):
+        self._send('mouseDown', button=button)
+
+    def mouseUp(self, button='left'):
+        self._send('mouseUp', button=button)
+
+    def quit(self):
+        """Force-quits PowerPoint for an app shutdown. Returns whether the process should exit as well."""
+        raise NotImplementedError
+
+    def size(self):
+        raise NotImplementedError
+
+    def _send(self, method, *args, **kwargs):
+        raise NotImplementedError
+
+
+class PyAutoGuiBackend(InputBackend):
+    """Sends events to the real keyboard and mouse."""
+
+    def __init__(self):
+        import pyautogui  # Needs a display, so only imported when actually used
+        self.pyautogui = pyautogui
+
+    def size(self):
+        return tuple(self.pyautogui.size())
+
+    def quit(self):
+        os.system('taskkill /F /IM POWERPNT.EXE')  # Before anything else, so PowerPoint can't prompt
+        return True
+
+    def _send(self, method, *args, **kwargs):
+        getattr(self.pyautogui, method)(*args, **kwargs)
+
+
+class RecordingBackend(InputBackend):
+    """Records events instead of sending them, for headless runs and tests."""
+
+    def __init__(self, screen_size=(1920, 1080), clock=time.perf_counter):
+        self.screen_size = screen_size
+        self.clock = clock
+        self.events = []  # (timestamp, method, args, kwargs)
+
+    def size(self):
+        return self.screen_size
+
+    def quit(self):
+        self._send('quit')
+        return False  # Headless runs carry on so they can still write their results
+
+    def _send(self, method, *args, **kwargs):
+        self.events.append((self.clock(), method, args, kwargs))
+
+
+def open_backend(name=None):
+    """Builds the backend named by name or $AIR_TRACKER_INPUT: 'pyautogui' (default) or 'recording'."""
+    name = name or os.environ.get(INPUT_ENV_VAR, 'pyautogui')
+    if name == 'recording':
+        return RecordingBackend()
+    if name == 'pyautogui':
+        return PyAutoGuiBackend()
+    raise ValueError(f"Unknown input backend: {name}")
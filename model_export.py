@@ -0,0 +1,311 @@
+"""Export the gesture model to a NumPy-only runtime, optionally with int8 weights.
+
+The exported .npz holds the layer stack as JSON plus its weights, so running
+the model needs nothing beyond NumPy: no Keras, no JAX. Supported are
+sequential stacks of Dense, Conv2D, pooling, Flatten, Reshape,
+BatchNormalization, Rescaling, Dropout and activation layers.
+
+    python model_export.py export [--int8] [--output model_lite.npz]
+    python model_export.py bench model_lite.npz landmarks.npz [--reference]
+
+landmarks.npz holds 'landmarks' (N, 21, 3) and optionally 'labels' (N,).
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+LITE_FORMAT = 1
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'relu6': lambda x: np.clip(x, 0, 6),
+    'sigmoid': lambda x: 1 / (1 + np.exp(-x)),
+    'tanh': np.tanh,
+    'elu': lambda x: np.where(x > 0, x, np.expm1(np.minimum(x, 0))),
+    'swish': lambda x: x / (1 + np.exp(-x)),
+    'silu': lambda x: x / (1 + np.exp(-x)),
+    'softmax': lambda x: _softmax(x, -1),
+}
+
+
+def _softmax(x, axis):
+    e = np.exp(x - x.max(axis=axis, keepdims=True))
+    return e / e.sum(axis=axis, keepdims=True)
+
+
+def _activation_name(activation):
+    if isinstance(activation, dict):  # Serialized activation object
+        activation = activation.get('config', {}).get('name', activation.get('class_name'))
+    return activation or 'linear'
+
+
+def quantize_int8(kernel):
+    """Symmetric per-output-channel int8 quantization. Returns (int8 values, float32 scales)."""
+    flat = kernel.reshape(-1, kernel.shape[-1])
+    scales = np.abs(flat).max(axis=0) / 127.0
+    scales[scales == 0] = 1.0
+    q = np.clip(np.round(kernel / scales), -127, 127).astype(np.int8)
+    return q, scales.astype(np.float32)
+
+
+def export_model(model, path, quantize=False):
+    """Writes a Keras model's layers and weights to a .npz readable by LiteModel."""
+    layers = []
+    arrays = {}
+
+    def add_kernel(i, kernel):
+        kernel = np.asarray(kernel, np.float32)
+        if quantize:
+            q, scales = quantize_int8(kernel)
+            arrays[f"{i}_kernel_q"] = q
+            arrays[f"{i}_kernel_scale"] = scales
+        else:
+            arrays[f"{i}_kernel"] = kernel
+
+    for i, layer in enumerate(model.layers):
+        kind = type(layer).__name__
+        config = layer.get_config()
+        weights = [np.asarray(w, np.float32) for w in layer.get_weights()]
+        spec = {'type': kind}
+
+        if kind in ('InputLayer', 'Dropout', 'SpatialDropout2D', 'GaussianNoise'):
+            continue  # Nothing to do at inference time
+        elif kind == 'Dense':
+            add_kernel(i, weights[0])
+            if config.get('use_bias', True):
+                arrays[f"{i}_bias"] = weights[1]
+            spec['activation'] = _activation_name(config.get('activation'))
+        elif kind == 'Conv2D':
+            if config.get('data_format', 'channels_last') != 'channels_last' or tuple(config.get('dilation_rate', (1, 1))) != (1, 1):
+                raise ValueError(f"Unsupported Conv2D configuration in layer {layer.name}")
+            add_kernel(i, weights[0])
+            if config.get('use_bias', True):
+                arrays[f"{i}_bias"] = weights[1]
+            spec.update(strides=list(config['strides']), padding=config['padding'],
+                        activation=_activation_name(config.get('activation')))
+        elif kind in ('MaxPooling2D', 'AveragePooling2D'):
+            spec.update(pool_size=list(config['pool_size']),
+                        strides=list(config.get('strides') or config['pool_size']), padding=config['padding'])
+        elif kind in ('Flatten', 'GlobalAveragePooling2D', 'GlobalMaxPooling2D'):
+            pass
+        elif kind == 'Reshape':
+            spec['target_shape'] = list(config['target_shape'])
+        elif kind == 'BatchNormalization':
+            # Folded into one multiply-add
+            index = 0
+            gamma = weights[index] if config.get('scale', True) else None
+            index += gamma is not None
+            beta = weights[index] if config.get('center', True) else None
+            index += beta is not None
+            mean, variance = weights[index], weights[index + 1]
+            scale = (gamma if gamma is not None else 1.0) / np.sqrt(variance + config['epsilon'])
+            arrays[f"{i}_scale"] = scale.astype(np.float32)
+            arrays[f"{i}_shift"] = ((beta if beta is not None else 0.0) - mean * scale).astype(np.float32)
+        elif kind == 'Rescaling':
+            spec.update(scale=float(config['scale']), offset=float(config['offset']))
+        elif kind == 'Activation':
+            spec['activation'] = _activation_name(config['activation'])
+        elif kind == 'ReLU':
+            spec.update(max_value=config.get('max_value'), negative_slope=float(config.get('negative_slope', 0.0)))
+        elif kind == 'Softmax':
+            spec['axis'] = config.get('axis', -1)
+        else:
+            raise ValueError(f"Layer {layer.name} ({kind}) is not supported by the lite runtime")
+
+        spec['index'] = i
+        layers.append(spec)
+
+    header = {'format': LITE_FORMAT, 'quantized': quantize, 'layers': layers}
+    np.savez_compressed(path, header=np.frombuffer(json.dumps(header).encode('utf-8'), np.uint8), **arrays)
+
+
+class LiteModel:
+    """Runs an exported model with NumPy. Callable like a Keras model on float32 NHWC/NC batches."""
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            header = json.loads(bytes(data['header']).decode('utf-8'))
+            if header.get('format') != LITE_FORMAT:
+                raise ValueError(f"Unsupported lite model format: {header.get('format')}")
+            self.quantized = header['quantized']
+            self.layers = header['layers']
+            self.weights = {}
+            for name in data.files:
+                if name.endswith('_kernel_q'):
+                    # Dequantized once at load; the file stays a quarter of the float size
+                    prefix = name[:-len('_kernel_q')]
+                    self.weights[prefix + '_kernel'] = data[name].astype(np.float32) * data[prefix + '_kernel_scale']
+                elif name != 'header' and not name.endswith('_kernel_scale'):
+                    self.weights[name] = data[name]
+
+    def __call__(self, x, training=False):
+        x = np.asarray(x, np.float32)
+        for spec in self.layers:
+            x = self._run_layer(spec, x)
+        return x
+
+    def predict(self, x, verbose=0):
+        return self(x)
+
+    def _run_layer(self, spec, x):
+        kind, i = spec['type'], spec['index']
+        weights = self.weights
+        if kind == 'Dense':
+            x = x @ weights[f"{i}_kernel"]
+            if f"{i}_bias" in weights:
+                x = x + weights[f"{i}_bias"]
+            return ACTIVATIONS[spec['activation']](x)
+        if kind == 'Conv2D':
+            x = _conv2d(x, weights[f"{i}_kernel"], spec['strides'], spec['padding'])
+            if f"{i}_bias" in weights:
+                x = x + weights[f"{i}_bias"]
+            return ACTIVATIONS[spec['activation']](x)
+        if kind in ('MaxPooling2D', 'AveragePooling2D'):
+            return _pool2d(x, spec['pool_size'], spec['strides'], spec['padding'], kind == 'MaxPooling2D')
+        if kind == 'Flatten':
+            return x.reshape(len(x), -1)
+        if kind == 'GlobalAveragePooling2D':
+            return x.mean(axis=(1, 2))
+        if kind == 'GlobalMaxPooling2D':
+            return x.max(axis=(1, 2))
+        if kind == 'Reshape':
+            return x.reshape(len(x), *spec['target_shape'])
+        if kind == 'BatchNormalization':
+            return x * weights[f"{i}_scale"] + weights[f"{i}_shift"]
+        if kind == 'Rescaling':
+            return x * spec['scale'] + spec['offset']
+        if kind == 'Activation':
+            return ACTIVATIONS[spec['activation']](x)
+        if kind == 'ReLU':
+            x = np.where(x > 0, x, x * spec['negative_slope'])
+            return x if spec['max_value'] is None else np.minimum(x, spec['max_value'])
+        if kind == 'Softmax':
+            return _softmax(x, spec['axis'])
+        raise ValueError(f"Unknown layer type {kind}")
+
+
+def _same_padding(size, kernel, stride):
+    out = -(-size // stride)
+    total = max((out - 1) * stride + kernel - size, 0)
+    return total // 2, total - total // 2
+
+
+def _pad_same(x, kernel, strides, value=0.0):
+    top, bottom = _same_padding(x.shape[1], kernel[0], strides[0])
+    left, right = _same_padding(x.shape[2], kernel[1], strides[1])
+    return np.pad(x, ((0, 0), (top, bottom), (left, right), (0, 0)), constant_values=value)
+
+
+def _conv2d(x, kernel, strides, padding):
+    kh, kw = kernel.shape[:2]
+    if padding == 'same':
+        x = _pad_same(x, (kh, kw), strides)
+    # (N, H', W', C, kh, kw) windows without copying, then one tensordot against the kernel
+    windows = sliding_window_view(x, (kh, kw), axis=(1, 2))[:, ::strides[0], ::strides[1]]
+    return np.tensordot(windows, kernel.transpose(2, 0, 1, 3), axes=([3, 4, 5], [0, 1, 2]))
+
+
+def _pool2d(x, pool_size, strides, padding, use_max):
+    def windows_of(a):
+        return sliding_window_view(a, tuple(pool_size), axis=(1, 2))[:, ::strides[0], ::strides[1]]
+
+    if use_max:
+        if padding == 'same':
+            x = _pad_same(x, pool_size, strides, -np.inf)
+        return windows_of(x).max(axis=(4, 5))
+    if padding != 'same':
+        return windows_of(x).mean(axis=(4, 5))
+    # Like Keras, average only the cells inside the input, not the zero padding
+    valid = _pad_same(np.ones((1, x.shape[1], x.shape[2], 1), np.float32), pool_size, strides)
+    total = windows_of(_pad_same(x, pool_size, strides)).sum(axis=(4, 5))
+    return total / windows_of(valid).sum(axis=(4, 5))
+
+
+def compare(reference, lite, inputs, batch_size=32):
+    """Accuracy delta of a lite model against the reference model on the same inputs."""
+    ref_out = np.concatenate([np.asarray(reference(inputs[i:i + batch_size], training=False))
+                              for i in range(0, len(inputs), batch_size)])
+    lite_out = np.concatenate([lite(inputs[i:i + batch_size]) for i in range(0, len(inputs), batch_size)])
+    diff = np.abs(ref_out - lite_out)
+    return {
+        'samples': len(inputs),
+        'top1_agreement': float((ref_out.argmax(axis=1) == lite_out.argmax(axis=1)).mean()),
+        'max_abs_diff': float(diff.max()),
+        'mean_abs_diff': float(diff.mean()),
+    }
+
+
+def time_model(model, inputs, repeats=3):
+    """Mean ms per call for single samples and for the whole batch."""
+    single = []
+    for x in inputs[:min(len(inputs), 200)]:
+        start = time.perf_counter()
+        model(x[np.newaxis], training=False)
+        single.append((time.perf_counter() - start) * 1000)
+    batch = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model(inputs, training=False)
+        batch.append((time.perf_counter() - start) * 1000)
+    return {'single_ms': float(np.mean(single)), 'batch_ms': float(np.mean(batch)), 'batch_size': len(inputs)}
+
+
+def load_landmark_dataset(path):
+    """Turns a recorded landmarks.npz into model inputs (and labels, if recorded)."""
+    from gesture_model import landmark_vector
+
+    data = np.load(path)
+    inputs = np.stack([landmark_vector(frame) for frame in data['landmarks']])
+    labels = data['labels'] if 'labels' in data.files else None
+    return inputs, labels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help="convert the cached gesture model")
+    export.add_argument('--int8', action='store_true', help="store int8 per-channel quantized kernels")
+    export.add_argument('--output', default=None, help="defaults to model_lite.npz in the model cache")
+    bench = commands.add_parser('bench', help="benchmark a lite model on recorded landmarks")
+    bench.add_argument('model')
+    bench.add_argument('dataset')
+    bench.add_argument('--reference', action='store_true', help="also run the Keras model and compare")
+    args = parser.parse_args(argv)
+
+    from model_manager import ModelManager
+
+    if args.command == 'export':
+        manager = ModelManager(runtime='keras')
+        model = manager.get()
+        if model is None:
+            print("Gesture model is unavailable, nothing to export")
+            return 1
+        output = args.output or manager.lite_path
+        export_model(model, output, quantize=args.int8)
+        shape = [dim or 1 for dim in model.input_shape]
+        samples = np.random.default_rng(0).random([64] + shape[1:], dtype=np.float32)
+        print(f"Exported to {output}")
+        print(json.dumps(compare(model, LiteModel(output), samples), indent=2))
+        return 0
+
+    lite = LiteModel(args.model)
+    inputs, labels = load_landmark_dataset(args.dataset)
+    report = {'lite': time_model(lite, inputs)}
+    if labels is not None:
+        report['lite']['accuracy'] = float((lite(inputs).argmax(axis=1) == labels).mean())
+    if args.reference:
+        reference = ModelManager(runtime='keras').get()
+        if reference is not None:
+            report['keras'] = time_model(reference, inputs)
+            report['delta'] = compare(reference, lite, inputs)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
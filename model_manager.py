@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import threading
+
+MODEL_SOURCE = "hf://saaday5/hand_gesture_model"
+MODEL_VERSION = "1"
+MODEL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".air_tracker", "models")
+OFFLINE_ENV_VAR = "AIR_TRACKER_OFFLINE"
+RUNTIME_ENV_VAR = "AIR_TRACKER_MODEL_RUNTIME"  # 'auto' (default), 'lite' or 'keras'
+KERAS_BACKEND = "jax"  # Available backend options are: "jax", "torch", "tensorflow".
+
+
+def sha256_of(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def offline_mode():
+    return os.environ.get(OFFLINE_ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+class ModelManager:
+    """Loads the gesture model lazily, from a local cache when it can.
+
+    Nothing is imported or fetched until get() or warmup() is called. The
+    model is kept in <cache_dir>/<name>/<version>/model.keras next to a
+    manifest with its sha256; a cached file that fails the checksum is
+    fetched again. In offline mode ($AIR_TRACKER_OFFLINE=1) the hub is never
+    contacted and the model is simply unavailable if it isn't cached.
+
+    If model_export.py has written model_lite.npz next to it, the 'auto' and
+    'lite' runtimes run that with NumPy and never import keras at all.
+
+    labels() gives the model's class names, from a 'labels' list in the
+    manifest or a labels.txt next to the model; a model has none until they
+    are added there.
+    """
+
+    def __init__(self, source=MODEL_SOURCE, version=MODEL_VERSION, cache_dir=MODEL_CACHE_DIR, offline=None,
+                 runtime=None):
+        self.source = source
+        self.version = version
+        name = source.split("://", 1)[-1].replace("/", "_")
+        self.directory = os.path.join(cache_dir, name, version)
+        self.offline = offline_mode() if offline is None else offline
+        self.runtime = runtime or os.environ.get(RUNTIME_ENV_VAR, "auto")
+        self.model = None
+        self.status = "idle"  # idle, loading, ready or unavailable
+        self.error = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def model_path(self):
+        return os.path.join(self.directory, "model.keras")
+
+    @property
+    def lite_path(self):
+        return os.path.join(self.directory, "model_lite.npz")
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, "manifest.json")
+
+    @property
+    def labels_path(self):
+        return os.path.join(self.directory, "labels.txt")
+
+    def labels(self):
+        """Class index -> gesture name, from the manifest's 'labels' or labels.txt; None if neither has them."""
+        try:
+            with open(self.manifest_path) as f:
+                labels = json.load(f).get("labels")
+            if labels:
+                return list(labels)
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(self.labels_path) as f:
+                return [line.strip() for line in f if line.strip()] or None
+        except OSError:
+            return None
+
+    def warmup(self):
+        """Starts loading (and compiling) the model on a background thread. Returns immediately."""
+        with self._lock:
+            if self.status != "idle":
+                return
+            self.status = "loading"
+            self._thread = threading.Thread(target=self._load, name="model-warmup", daemon=True)
+            self._thread.start()
+
+    def ready(self):
+        return self.status == "ready"
+
+    def get(self, timeout=None):
+        """Returns the model, loading it now if nobody started it yet, or None if it is unavailable.
+
+        With a timeout, waits at most that long for a background load and
+        returns None if it hasn't finished.
+        """
+        with self._lock:
+            load_here = self.status == "idle"
+            if load_here:
+                self.status = "loading"
+        if load_here:
+            self._load()
+        elif not self._done.wait(timeout):
+            return None
+        return self.model
+
+    def _load(self):
+        try:
+            if self.runtime in ("auto", "lite") and os.path.exists(self.lite_path):
+                from model_export import LiteModel
+                self.model = LiteModel(self.lite_path)
+                self.status = "ready"
+                return
+            if self.runtime == "lite":
+                raise FileNotFoundError(f"No exported lite model at {self.lite_path}")
+
+            # Must be set before keras is imported for the first time
+            os.environ.setdefault("KERAS_BACKEND", KERAS_BACKEND)
+            import keras
+
+            model = self._load_cached(keras)
+            if model is None and not self.offline:
+                model = keras.saving.load_model(self.source)
+                self._store(model)
+            if model is None:
+                raise FileNotFoundError(f"No cached model in {self.directory} and offline mode is on")
+
+            self._compile(model)
+            self.model = model
+            self.status = "ready"
+        except Exception as e:
+            print(f"Error loading model: {e}")
+            self.error = e
+            self.status = "unavailable"
+        finally:
+            self._done.set()
+
+    def _load_cached(self, keras):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != self.version or not os.path.exists(self.model_path):
+            return None
+        if sha256_of(self.model_path) != manifest.get("sha256"):
+            print(f"Cached model {self.model_path} failed its checksum, ignoring it")
+            return None
+        return keras.saving.load_model(self.model_path)
+
+    def _store(self, model):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            model.save(self.model_path)
+            manifest = {"source": self.source, "version": self.version, "sha256": sha256_of(self.model_path)}
+            labels = self.labels()
+            if labels:
+                manifest["labels"] = labels  # Keep labels added by hand when the model is fetched again
+            with open(self.manifest_path, "w") as f:
+                json.dump(manifest, f, indent=2)
+        except Exception as e:
+            print(f"Error caching model: {e}")
+
+    def _compile(self, model):
+        """Runs one dummy prediction so the backend compiles before the first real frame."""
+        import numpy as np
+
+        shape = [dim or 1 for dim in model.input_shape]
+        model.predict(np.zeros(shape, np.float32), verbose=0)
+
+
+# One loader shared by everything that needs the gesture model
+gesture_models = ModelManager()
@@ -3,35 +3,34 @@ import threading
 from PIL import Image, ImageTk
 from cvzone.HandTrackingModule import HandDetector
 import pyautogui
-import time
 import numpy as np
-import keras
 from tkinter import Label
-import comtypes.client
 import os
 import mediapipe as mp  # Add this import
+from frame_source import open_source
+from gestures import GESTURES
+from cooldowns import shared_cooldowns
+from model_manager import gesture_models
+from gesture_model import preprocess_crop
+from startup import lazy_import
+from action_executor import ActionExecutor
+from input_backend import PyAutoGuiBackend
 
-# Available backend options are: "jax", "torch", "tensorflow".
-os.environ["KERAS_BACKEND"] = "jax"
+comtypes = lazy_import("comtypes", windows_only=True)
 
 # Initialize the hand detector
 detector = HandDetector(detectionCon=0.7, maxHands=1)
 
-# Flags for cooldowns and video state
-video_toggle_cooldown = False
-slide_toggle_cooldown = False
-zoom_out_cooldown = False
-zoom_in_cooldown = False  # Added zoom-in cooldown
-enter_key_cooldown = False
-close_ppt_cooldown = False  # Added close PPT cooldown
+# Cooldowns per gesture group and video state
+cooldowns = shared_cooldowns
 video_playing = False
 
-# Load the trained model
-try:
-    model = keras.saving.load_model("hf://saaday5/hand_gesture_model")
-except FileNotFoundError as e:
-    print(f"Error loading model: {e}")
-    model = None
+# Input actions with waits in them run here instead of blocking the camera loop
+actions = ActionExecutor(PyAutoGuiBackend())
+
+# The trained model is loaded by the model manager on first get(); this loop classifies with
+# fingersUp and never runs it, so it isn't warmed up here
+model_manager = gesture_models
 
 # Initialize Mediapipe Hands object for hand tracking
 mpHands = mp.solutions.hands
@@ -119,19 +118,16 @@ canvas = np.zeros((480, 640, 3), np.uint8)
 
 def preprocess_hand_image(hand_bbox, img):
     """Extracts and preprocesses the hand region for the model."""
-    x, y, w, h = hand_bbox
-    hand_img = img[y:y + h, x:x + w]
-    hand_img = cv2.resize(hand_img, (64, 64))  # Assuming the model expects 64x64 input
-    hand_img = cv2.cvtColor(hand_img, cv2.COLOR_BGR2RGB)
-    hand_img = hand_img / 255.0  # Normalize to [0, 1]
-    hand_img = np.expand_dims(hand_img, axis=0)  # Add batch dimension
-    return hand_img
-
-def start_camera(camera_label: Label):
-    """Starts the camera feed and gesture detection."""
-    global video_toggle_cooldown, slide_toggle_cooldown, zoom_out_cooldown, zoom_in_cooldown, enter_key_cooldown, close_ppt_cooldown, video_playing
+    hand_img = preprocess_crop(img, hand_bbox)  # 64x64 RGB float32 in [0, 1]
+    return hand_img[np.newaxis]  # Add batch dimension
+
+def start_camera(camera_label: Label, source=None):
+    """Starts the camera feed and gesture detection.
+
+    source is anything frame_source.open_source accepts; the default is the webcam.
+    """
     width, height = 300, 200
-    cap = cv2.VideoCapture(0)
+    cap = open_source(source)
 
     if not cap.isOpened():
         print("Error: Could not open video device.")
@@ -143,7 +139,7 @@ def start_camera(camera_label: Label):
     # gesture_handler = GestureHandler()
 
     def update_frame():
-        global video_toggle_cooldown, slide_toggle_cooldown, zoom_out_cooldown, zoom_in_cooldown, enter_key_cooldown, close_ppt_cooldown, video_playing
+        global video_playing
 
         success, img = cap.read()
         if success:
@@ -161,50 +157,13 @@ def start_camera(camera_label: Label):
                 screen_x = int(lm_list[8][0] / width * screen_x)
                 screen_y = int(lm_list[8][1] / height * screen_y)
 
-                # Play/pause toggle gesture with 2-second cooldown
-                if fingers_up == [1, 1, 0, 0, 0] and not video_toggle_cooldown:
-                    click_video()  # Toggle video playback
-                    video_playing = not video_playing  # Update playback state
-                    video_toggle_cooldown = True
-                    camera_label.after(2000, reset_video_toggle_cooldown)  # 2-second cooldown
-
-                # Slide navigation gestures
-                elif fingers_up == [1, 0, 0, 0, 0]:  # Thumb up to move left
-                    if not slide_toggle_cooldown:
-                        move_slide_backward()
-                        slide_toggle_cooldown = True
-                        camera_label.after(1000, reset_slide_toggle_cooldown)  # 1-second cooldown
-
-                elif fingers_up == [0, 0, 0, 0, 1]:  # Pinky up to move right
-                    if not slide_toggle_cooldown:
-                        move_slide_forward()
-                        slide_toggle_cooldown = True
-                        camera_label.after(1000, reset_slide_toggle_cooldown)  # 1-second cooldown
-
-                # Zoom-out gesture: 4 fingers without thumb (3-second cooldown)
-                elif fingers_up == [0, 1, 1, 1, 1] and not zoom_out_cooldown:
-                    trigger_zoom_out()
-                    zoom_out_cooldown = True
-                    camera_label.after(3000, reset_zoom_out_cooldown)  # 3-second cooldown
-
-                # Zoom-in gesture: 3 fingers (index, middle, ring) up (1-second cooldown)
-                elif fingers_up == [0, 0, 1, 1, 1] and not zoom_in_cooldown:
-                    trigger_zoom_in()
-                    zoom_in_cooldown = True
-                    camera_label.after(1000, reset_zoom_in_cooldown)  # 1-second cooldown
-
-                # Enter key gesture: Index, middle, and ring fingers up (2-second cooldown)
-                elif fingers_up == [0, 1, 1, 1, 0] and not enter_key_cooldown:
-                    trigger_enter_key()
-                    enter_key_cooldown = True
-                    camera_label.after(2000, reset_enter_key_cooldown)  # 2-second cooldown
-
-                # Close PPT gesture: Thumb and pinky up (2-second cooldown)
-                elif fingers_up == [1, 0, 0, 0, 1] and not close_ppt_cooldown:
-                    save_and_close_ppt()
-                    close_ppt_cooldown = True
-                    camera_label.after(2000, reset_close_ppt_cooldown)  # 2-second cooldown
-
+                # Discrete gestures come from the shared table in gestures.py
+                gesture = GESTURES.classify(fingers_up)
+                if gesture is not None and gesture.name in ACTIONS:
+                    if cooldowns.trigger(gesture.cooldown_group, gesture.cooldown):
+                        ACTIONS[gesture.name]()
+                        if gesture.name == 'toggle_video':
+                            video_playing = not video_playing  # Update playback state
                 else:
                     # gesture_handler.deactivate_drawing_tools()
                     pass
@@ -299,10 +258,12 @@ def click_video():
     """Simulates a mouse click to toggle video playback."""
     try:
         screen_width, screen_height = pyautogui.size()
-        pyautogui.moveTo(screen_width // 2 + 50, screen_height // 2)
-        time.sleep(1)
-        pyautogui.moveTo(screen_width // 2, screen_height // 2)
-        pyautogui.hotkey('alt', 'p')
+        actions.submit('click_video', [
+            ('moveTo', screen_width // 2 + 50, screen_height // 2),
+            ('wait', 1.0),
+            ('moveTo', screen_width // 2, screen_height // 2),
+            ('hotkey', 'alt', 'p'),
+        ])
     except Exception as e:
         print(f"Error toggling video: {e}")
 
@@ -350,37 +311,18 @@ def save_and_close_ppt():
                 presentation.Save()
                 presentation.Close()
         powerpoint.Quit()
-        time.sleep(2)  # Add a delay before minimizing all windows
-        pyautogui.hotkey('win', 'd')  # Minimize all windows to show the desktop
+        # Wait for PowerPoint to go away, then minimize all windows to show the desktop
+        actions.submit('show_desktop', [('wait', 2.0), ('hotkey', 'win', 'd')])
     except Exception as e:
         print(f"Error saving and closing PowerPoint: {e}")
 
-def reset_video_toggle_cooldown():
-    """Resets the cooldown for video toggle."""
-    global video_toggle_cooldown
-    video_toggle_cooldown = False
-
-def reset_slide_toggle_cooldown():
-    """Resets the cooldown for slide navigation."""
-    global slide_toggle_cooldown
-    slide_toggle_cooldown = False
-
-def reset_zoom_out_cooldown():
-    """Resets the cooldown for zoom out."""
-    global zoom_out_cooldown
-    zoom_out_cooldown = False
-
-def reset_zoom_in_cooldown():
-    """Resets the cooldown for zoom in."""
-    global zoom_in_cooldown
-    zoom_in_cooldown = False
-
-def reset_enter_key_cooldown():
-    """Resets the cooldown for enter key."""
-    global enter_key_cooldown
-    enter_key_cooldown = False
-
-def reset_close_ppt_cooldown():
-    """Resets the cooldown for closing the PowerPoint presentation."""
-    global close_ppt_cooldown
-    close_ppt_cooldown = False
\ No newline at end of file
+# Gesture name -> action for the gestures this entry point supports
+ACTIONS = {
+    'toggle_video': click_video,
+    'slide_backward': move_slide_backward,
+    'slide_forward': move_slide_forward,
+    'zoom_out': trigger_zoom_out,
+    'zoom_in': trigger_zoom_in,
+    'enter': trigger_enter_key,
+    'close': save_and_close_ppt,
+}
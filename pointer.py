@@ -0,0 +1,81 @@
+import math
+import time
+
+
+class PointerItem:
+    """The on-canvas pointer: one persistent oval moved with coords() instead of recreated.
+
+    Moves are throttled to max_rate per second (the display refresh rate) and
+    the fill is only reconfigured when it actually changes. With lead > 0 the
+    pointer is drawn where the fingertip is expected to be lead seconds from
+    now, based on its recent velocity, which hides part of the detection
+    latency.
+    """
+
+    def __init__(self, canvas, radius=5, fill='black', outline='black', max_rate=60, lead=0.0,
+                 max_lead_px=40, velocity_smoothing=0.5):
+        self.canvas = canvas
+        self.radius = radius
+        self.fill = fill
+        self.min_interval = 1.0 / max_rate if max_rate else 0.0
+        self.lead = lead
+        self.max_lead_px = max_lead_px
+        self.velocity_smoothing = velocity_smoothing
+        self.vx = self.vy = 0.0
+        self.moves = 0
+        self.throttled = 0
+        self._last_sample = None  # (x, y, t) of the last observed fingertip position
+        self._last_move = 0.0
+        # Start off screen until the first position arrives
+        self.item = canvas.create_oval(-2 * radius, -2 * radius, 0, 0, fill=fill, outline=outline, tags="pointer")
+
+    def set_fill(self, color):
+        if color != self.fill:
+            self.canvas.itemconfig(self.item, fill=color)
+            self.fill = color
+
+    def move(self, x, y, now=None):
+        """Records a fingertip position and moves the pointer if the refresh budget allows.
+
+        Returns True if the canvas item was moved.
+        """
+        now = time.perf_counter() if now is None else now
+        self._update_velocity(x, y, now)
+        if now - self._last_move < self.min_interval:
+            self.throttled += 1
+            return False
+
+        px, py = self.predict(x, y)
+        r = self.radius
+        self.canvas.coords(self.item, px - r, py - r, px + r, py + r)
+        self._last_move = now
+        self.moves += 1
+        return True
+
+    def predict(self, x, y):
+        """Extrapolates (x, y) by lead seconds, capped at max_lead_px."""
+        if not self.lead:
+            return x, y
+        dx, dy = self.vx * self.lead, self.vy * self.lead
+        distance = math.hypot(dx, dy)
+        if distance > self.max_lead_px:
+            scale = self.max_lead_px / distance
+            dx, dy = dx * scale, dy * scale
+        return int(x + dx), int(y + dy)
+
+    def hide(self):
+        """Moves the pointer off screen and forgets its velocity."""
+        r = self.radius
+        self.canvas.coords(self.item, -2 * r, -2 * r, 0, 0)
+        self._last_sample = None
+        self.vx = self.vy = 0.0
+
+    def _update_velocity(self, x, y, now):
+        if self._last_sample is not None:
+            last_x, last_y, last_t = self._last_sample
+            dt = now - last_t
+            if dt > 0:
+                a = self.velocity_smoothing
+                self.vx = a * (x - last_x) / dt + (1 - a) * self.vx
+                self.vy = a * (y - last_y) / dt + (1 - a) * self.vy
+        self._last_sample = (x, y, now)
@@ -0,0 +1,136 @@
+import tkinter as tk
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+from strokes import Stroke, StrokeSimplifier
+from tk_monitor import shared_monitor
+
+
+class RasterAnnotationLayer:
+    """Annotation backend that paints strokes into an RGBA NumPy raster.
+
+    Drop-in alternative to strokes.StrokeLayer. The screen is split into
+    tiles, each shown by one canvas image item created the first time it is
+    drawn on. After each batch of points only the tiles under dirty rectangles
+    are re-uploaded, so drawing cost does not depend on how much ink is
+    already on screen. The eraser clears pixels back to transparent.
+    """
+
+    def __init__(self, canvas, width, height, tile_size=128, simplifier=None):
+        self.canvas = canvas
+        self.simplifier = simplifier or StrokeSimplifier()
+        self.width, self.height = width, height
+        self.tile_size = tile_size
+        self.raster = np.zeros((height, width, 4), np.uint8)
+        self.strokes = []  # Finished strokes, kept for persistence
+        self.active = None
+        self._line_options = {}
+        self._tiles = {}  # (col, row) -> (canvas item, PhotoImage)
+        self._dirty = set()
+        self._flush_pending = False
+        self._colors = {}
+
+    def begin(self, color, width, tool='pen', **line_options):
+        """Starts a new stroke, finishing the active one first."""
+        self.end()
+        self.active = Stroke(color, width, tool)
+        self._line_options = line_options
+        self.simplifier.reset()
+        return self.active
+
+    def add_point(self, x, y, color=None, width=None, tool='pen', **line_options):
+        """Appends a point to the active stroke and paints the new segment."""
+        stroke = self.active
+        if stroke is None or (color is not None and (color, width, tool) != (stroke.color, stroke.width, stroke.tool)):
+            stroke = self.begin(color, width, tool, **line_options)
+        x, y = int(x), int(y)
+        last = stroke.last_point()
+        if self.simplifier.push(stroke, x, y) is None:
+            return
+        # Paint from the previous point even if the simplifier replaced it; it lies on the same line
+        self._paint_segment(stroke, last or (x, y), (x, y))
+        self._schedule_flush()
+
+    def end(self):
+        """Finishes the active stroke, if any."""
+        if self.active is None:
+            return
+        if len(self.active):
+            self.active.freeze()
+            self.strokes.append(self.active)
+        self.active = None
+
+    def clear(self):
+        """Erases the raster and removes every tile from the canvas."""
+        self.end()
+        self.raster[...] = 0
+        for item, _ in self._tiles.values():
+            self.canvas.delete(item)
+        self._tiles = {}
+        self._dirty = set()
+        self.strokes = []
+
+    def replay(self, strokes):
+        """Paints finished strokes, e.g. ones loaded from disk, and adds them to the layer."""
+        self.end()
+        for stroke in strokes:
+            points = stroke.points
+            previous = (points[0], points[1])
+            for i in range(0, len(points), 2):
+                point = (points[i], points[i + 1])
+                self._paint_segment(stroke, previous, point)
+                previous = point
+            self.strokes.append(stroke)
+        self._schedule_flush()
+
+    def flush(self):
+        """Uploads the dirty tiles to Tk."""
+        self._flush_pending = False
+        size = self.tile_size
+        for col, row in self._dirty:
+            x0, y0 = col * size, row * size
+            tile = Image.fromarray(self.raster[y0:y0 + size, x0:x0 + size], 'RGBA')
+            if (col, row) in self._tiles:
+                self._tiles[(col, row)][1].paste(tile)
+            else:
+                photo = ImageTk.PhotoImage(tile)
+                item = self.canvas.create_image(x0, y0, image=photo, anchor=tk.NW, tags="annotation")
+                # Keep tiles under the toolbar and pointer so they never swallow their events
+                self.canvas.tag_lower(item)
+                self._tiles[(col, row)] = (item, photo)
+        self._dirty = set()
+
+    def _schedule_flush(self):
+        # Coalesce every point added before Tk goes idle into one upload
+        if not self._flush_pending:
+            self._flush_pending = True
+            shared_monitor.after_idle(self.canvas, self.flush)
+
+    def _paint_segment(self, stroke, start, end):
+        if stroke.tool == 'eraser':
+            rgba = (0, 0, 0, 0)
+        else:
+            rgba = self._rgba(stroke.color)
+        thickness = max(int(stroke.width), 1)
+        cv2.line(self.raster, start, end, rgba, thickness, cv2.LINE_AA)
+
+        # Mark every tile touched by the segment's bounding box, padded by the line width
+        pad = thickness // 2 + 2
+        x0 = max(min(start[0], end[0]) - pad, 0)
+        y0 = max(min(start[1], end[1]) - pad, 0)
+        x1 = min(max(start[0], end[0]) + pad, self.width - 1)
+        y1 = min(max(start[1], end[1]) + pad, self.height - 1)
+        if x1 < x0 or y1 < y0:
+            return  # Entirely off screen
+        size = self.tile_size
+        for row in range(y0 // size, y1 // size + 1):
+            for col in range(x0 // size, x1 // size + 1):
+                self._dirty.add((col, row))
+
+    def _rgba(self, color):
+        """Converts a Tk colour name or #rrggbb string to an opaque RGBA tuple."""
+        if color not in self._colors:
+            r, g, b = (channel // 257 for channel in self.canvas.winfo_rgb(color))
+            self._colors[color] = (r, g, b, 255)
+        return self._colors[color]
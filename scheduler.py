@@ -0,0 +1,90 @@
+import math
+import time
+
+
+class AdaptiveScheduler:
+    """Decides how often hand detection runs, based on what the presenter is doing.
+
+    Detection runs on every frame while drawing or while the hand moves fast,
+    at hold_interval while a gesture cooldown makes new results mostly
+    irrelevant, and at idle_interval once no hand has been seen for idle_after
+    seconds. Intervals are in seconds.
+    """
+
+    def __init__(self, active_interval=0.0, normal_interval=0.033, hold_interval=0.1,
+                 idle_interval=0.25, idle_after=3.0, fast_speed=0.5,
+                 active_poll_ms=10, idle_poll_ms=50):
+        self.active_interval = active_interval
+        self.normal_interval = normal_interval
+        self.hold_interval = hold_interval
+        self.idle_interval = idle_interval
+        self.idle_after = idle_after
+        self.fast_speed = fast_speed  # Frame widths per second that count as fast movement
+        self.active_poll_ms = active_poll_ms
+        self.idle_poll_ms = idle_poll_ms
+        self.last_hand_time = None
+        self.last_detect_time = None
+        self.last_position = None
+        self.speed = 0.0
+        self.hold_until = 0.0
+        self.detections = 0
+        self.skipped = 0
+
+    def observe(self, hands, frame_width, now=None):
+        """Feeds the result of a detection pass back into the scheduler."""
+        now = time.monotonic() if now is None else now
+        if not hands:
+            self.last_position = None
+            self.speed = 0.0
+            return
+        x, y = hands[0]['lmList'][8][:2]
+        if self.last_position is not None and self.last_hand_time is not None:
+            last_x, last_y = self.last_position
+            dt = now - self.last_hand_time
+            if dt > 0:
+                self.speed = math.hypot(x - last_x, y - last_y) / frame_width / dt
+        self.last_position = (x, y)
+        self.last_hand_time = now
+
+    def hold(self, seconds, now=None):
+        """Lowers the detection rate while a gesture cooldown is running."""
+        now = time.monotonic() if now is None else now
+        self.hold_until = max(self.hold_until, now + seconds)
+
+    def state(self, drawing, now=None):
+        """Returns 'active', 'hold', 'idle' or 'normal'."""
+        now = time.monotonic() if now is None else now
+        if drawing or self.speed >= self.fast_speed:
+            return 'active'
+        if self.last_hand_time is None or now - self.last_hand_time >= self.idle_after:
+            return 'idle'
+        if now < self.hold_until:
+            return 'hold'
+        return 'normal'
+
+    def detection_interval(self, drawing, now=None):
+        state = self.state(drawing, now)
+        if state == 'active':
+            return self.active_interval
+        if state == 'idle':
+            return self.idle_interval
+        if state == 'hold':
+            return self.hold_interval
+        return self.normal_interval
+
+    def should_detect(self, drawing, now=None):
+        """Returns True if this frame should go through detection, and records the decision."""
+        now = time.monotonic() if now is None else now
+        interval = self.detection_interval(drawing, now)
+        if self.last_detect_time is not None and now - self.last_detect_time < interval:
+            self.skipped += 1
+            return False
+        self.last_detect_time = now
+        self.detections += 1
+        return True
+
+    def poll_delay(self, drawing, now=None):
+        """Milliseconds until update_frame should check for the next frame."""
+        if self.state(drawing, now) == 'idle':
+            return self.idle_poll_ms
+        return self.active_poll_ms
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+from strokes import encode_strokes, decode_strokes
+
+DEFAULT_ANNOTATION_DIR = os.path.join(os.path.expanduser("~"), ".air_tracker", "annotations")
+
+
+def presentation_key(ppt_file=None):
+    """Short stable key for a presentation, from its absolute path only.
+
+    Size and modification time are left out on purpose: saving the deck
+    (which the close gesture does) must not orphan the ink of every slide.
+    """
+    if not ppt_file:
+        return "untitled"
+    path = os.path.normcase(os.path.abspath(ppt_file))
+    name = os.path.splitext(os.path.basename(path))[0]
+    return f"{name}-{hashlib.sha1(path.encode('utf-8')).hexdigest()[:12]}"
+
+
+class SlideTracker:
+    """Tracks the current slide of the running slideshow.
+
+    The thread that drives PowerPoint (utils.run_powerpoint, where COM is
+    initialized) reads SlideShowWindows(1).View.CurrentShowPosition and
+    report()s it; the Tk thread picks changes up with poll(). Without
+    PowerPoint (or on other platforms) nothing is reported and a simulated
+    counter follows the forward/backward gestures, so annotations still
+    follow slides.
+    """
+
+    def __init__(self, start=1):
+        self.simulated = start
+        self._reported = None
+        self._version = 0  # Bumped whenever PowerPoint's position changes
+        self._seen = 0
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Returns the current slide index (1-based)."""
+        return self.simulated
+
+    def step(self, delta):
+        """Records a forward (+1) or backward (-1) move and returns the expected slide index."""
+        self.simulated = max(1, self.simulated + delta)
+        return self.simulated
+
+    def report(self, position):
+        """Records PowerPoint's show position. Safe to call from any thread."""
+        with self._lock:
+            if position != self._reported:
+                self._reported = position
+                self._version += 1
+
+    def poll(self, settle=False):
+        """Adopts PowerPoint's position if it changed since the last poll and returns it, else None.
+
+        With settle=True the last reported position is adopted even if it
+        hasn't changed, which undoes simulated steps PowerPoint didn't take
+        (e.g. past the last slide). Call from the Tk thread.
+        """
+        with self._lock:
+            position, version = self._reported, self._version
+        changed = version != self._seen
+        self._seen = version
+        if position is None or position == self.simulated or not (changed or settle):
+            return None
+        self.simulated = position
+        return position
+
+
+class SlideAnnotationStore:
+    """Per-slide strokes of one presentation, kept as compact encoded blobs.
+
+    Each slide is saved to <directory>/<presentation key>/slide_NNNN.stk in
+    the delta-encoded format of strokes.encode_strokes. Slides are read from
+    disk the first time they are needed and kept in memory until the cached
+    blobs exceed budget_bytes, after which the least recently used slides are
+    dropped (they are already on disk).
+    """
+
+    def __init__(self, key, directory=DEFAULT_ANNOTATION_DIR, budget_bytes=4 * 1024 * 1024):
+        self.key = key
+        self.directory = os.path.join(directory, key)
+        self.budget_bytes = budget_bytes
+        self.cache = OrderedDict()  # slide index -> encoded blob, most recently used last
+        self.cached_bytes = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def path(self, slide):
+        return os.path.join(self.directory, f"slide_{slide:04d}.stk")
+
+    def get(self, slide):
+        """Returns the saved strokes of a slide ([] if it has none)."""
+        blob = self.cache.get(slide)
+        if blob is None:
+            blob = self._read(slide)
+            self._cache(slide, blob)
+        else:
+            self.cache.move_to_end(slide)
+        if not blob:
+            return []
+        try:
+            return decode_strokes(blob)
+        except (ValueError, IndexError, struct.error) as e:
+            print(f"Error decoding annotations for slide {slide}: {e}")
+            self._cache(slide, b"")  # Report a corrupt file once, not on every visit
+            return []
+
+    def put(self, slide, strokes):
+        """Saves the strokes of a slide to memory and disk."""
+        blob = encode_strokes(strokes) if strokes else b""
+        self._cache(slide, blob)
+        try:
+            self._write(slide, blob)
+        except OSError as e:
+            print(f"Error saving annotations for slide {slide}: {e}")
+
+    def _read(self, slide):
+        try:
+            with open(self.path(slide), "rb") as f:
+                self.loads += 1
+                return f.read()
+        except FileNotFoundError:
+            return b""
+        except OSError as e:
+            print(f"Error loading annotations for slide {slide}: {e}")
+            return b""
+
+    def _write(self, slide, blob):
+        path = self.path(slide)
+        if not blob:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, path)  # Never leave a half-written slide behind
+
+    def _cache(self, slide, blob):
+        old = self.cache.pop(slide, None)
+        if old is not None:
+            self.cached_bytes -= len(old)
+        self.cache[slide] = blob
+        self.cached_bytes += len(blob)
+        # Evict least recently used slides, but always keep the one just touched
+        while self.cached_bytes > self.budget_bytes and len(self.cache) > 1:
+            _, evicted = self.cache.popitem(last=False)
+            self.cached_bytes -= len(evicted)
+            self.evictions += 1
@@ -0,0 +1,181 @@
+"""Startup helpers: lazy imports, platform shims and an import-time report.
+
+Run the app with --import-report (or AIR_TRACKER_IMPORT_REPORT=1) to print,
+like python -X importtime, how long every module took to import, plus the
+time until the main window was first shown.
+"""
+import importlib
+import importlib.abc
+import os
+import sys
+import time
+
+IMPORT_REPORT_FLAG = "--import-report"
+IMPORT_REPORT_ENV_VAR = "AIR_TRACKER_IMPORT_REPORT"
+IS_WINDOWS = sys.platform.startswith("win")
+
+PROCESS_START = time.perf_counter()
+
+
+class PlatformUnavailable(ImportError):
+    """Raised when a platform-specific module is used on a platform that doesn't have it."""
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access.
+
+    Submodules are imported on demand too, so lazy_import('comtypes').client
+    works like 'import comtypes.client'.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self._name)
+            import_timer.lazy_loads.append((self._name, time.perf_counter() - start))
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        module = self._load()
+        try:
+            return getattr(module, attr)
+        except AttributeError:
+            try:
+                return importlib.import_module(f"{self._name}.{attr}")
+            except ImportError:
+                raise AttributeError(f"module {self._name!r} has no attribute {attr!r}") from None
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__['_module'] is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+class MissingModule:
+    """Shim for a platform-specific module that doesn't exist on this platform.
+
+    Any use raises PlatformUnavailable, except that names ending in 'Error'
+    resolve to an exception class that is never raised, so except clauses
+    naming them (e.g. 'except comtypes.COMError') keep working.
+    """
+
+    def __init__(self, name, platform):
+        self.__dict__['_name'] = name
+        self.__dict__['_platform'] = platform
+
+    def __getattr__(self, attr):
+        if attr.endswith("Error"):
+            return type(attr, (Exception,), {})
+        if not attr.startswith("__"):
+            return MissingModule(f"{self._name}.{attr}", self._platform)
+        raise AttributeError(attr)
+
+    def __call__(self, *args, **kwargs):
+        raise PlatformUnavailable(f"{self._name} is only available on {self._platform}")
+
+    def __bool__(self):
+        return False
+
+
+def lazy_import(name, windows_only=False):
+    """Returns a module proxy that imports name on first use.
+
+    With windows_only=True, other platforms get a MissingModule shim instead.
+    """
+    if windows_only and not IS_WINDOWS:
+        return MissingModule(name, "Windows")
+    return LazyModule(name)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Times every module executed after install(), with self and cumulative times like -X importtime."""
+
+    def __init__(self):
+        self.records = []  # (name, self seconds, cumulative seconds, depth)
+        self.lazy_loads = []  # (name, seconds) for LazyModule imports
+        self.first_window = None
+        self._stack = []
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            sys.meta_path.insert(0, self)
+            self.installed = True
+
+    def find_spec(self, fullname, path=None, target=None):
+        # Ask the other finders, then wrap the loader they return
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def mark_first_window(self):
+        if self.first_window is None:
+            self.first_window = time.perf_counter() - PROCESS_START
+
+    def report(self, top=25):
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for name, own, cumulative, depth in self.records:
+            if cumulative >= 0.001 or depth == 0:
+                lines.append(f"import time: {own * 1e6:>9.0f} | {cumulative * 1e6:>10.0f} | {'  ' * depth}{name}")
+        slowest = sorted((r for r in self.records if r[3] == 0), key=lambda r: r[2], reverse=True)[:top]
+        lines.append("")
+        lines.append("Slowest top-level imports:")
+        for name, _, cumulative, _ in slowest:
+            lines.append(f"  {cumulative * 1000:8.1f} ms  {name}")
+        if self.lazy_loads:
+            lines.append("Deferred imports:")
+            for name, seconds in self.lazy_loads:
+                lines.append(f"  {seconds * 1000:8.1f} ms  {name}")
+        if self.first_window is not None:
+            lines.append(f"Time to first window: {self.first_window * 1000:.0f} ms")
+        return "\n".join(lines)
+
+
+class _TimedLoader:
+    def __init__(self, loader, timer):
+        self.loader = loader
+        self.timer = timer
+
+    def __getattr__(self, attr):
+        return getattr(self.loader, attr)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        timer = self.timer
+        stack = timer._stack
+        index = len(timer.records)
+        timer.records.append(None)  # Placeholder keeps parents listed before their children, like importtime
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            timer.records[index] = (module.__name__, cumulative - children, cumulative, len(stack))
+
+
+def report_requested(argv=None):
+    argv = sys.argv if argv is None else argv
+    return IMPORT_REPORT_FLAG in argv or os.environ.get(IMPORT_REPORT_ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+import_timer = ImportTimer()
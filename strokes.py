@@ -0,0 +1,258 @@
+import math
+import struct
+from array import array
+
+import numpy as np
+
+TOOLS = ('pen', 'highlighter', 'eraser')
+STROKE_MAGIC = b'STK1'
+
+
+class Stroke:
+    """One pen/highlighter/eraser stroke: its style and points packed as x0, y0, x1, y1, ..."""
+
+    def __init__(self, color, width, tool='pen'):
+        self.color = color
+        self.width = width
+        self.tool = tool
+        self.points = array('i')
+        self.frozen = False
+
+    def __len__(self):
+        return len(self.points) // 2
+
+    def append(self, x, y):
+        if self.frozen:
+            raise ValueError("Cannot add points to a finished stroke")
+        self.points.append(int(x))
+        self.points.append(int(y))
+
+    def replace_last(self, x, y):
+        if self.frozen:
+            raise ValueError("Cannot change a finished stroke")
+        self.points[-2] = int(x)
+        self.points[-1] = int(y)
+
+    def last_point(self):
+        if not self.points:
+            return None
+        return self.points[-2], self.points[-1]
+
+    def freeze(self):
+        """Marks the stroke finished; its points no longer change."""
+        self.frozen = True
+
+
+class StrokeSimplifier:
+    """Simplifies a stroke online, as its points arrive.
+
+    Points closer than min_distance to the last kept point are dropped
+    (radial-distance filter). If the last kept point and every point it
+    already absorbed stay within tolerance of the straight segment from the
+    anchor (the point before it) to the new point, the last point is moved
+    to the new position instead of adding one, which is a sliding-window
+    Douglas-Peucker. Both thresholds are in canvas pixels, below what the
+    eye can tell apart at pen widths.
+    """
+
+    def __init__(self, min_distance=3.0, tolerance=1.0, max_absorbed=64):
+        self.min_distance = min_distance
+        self.tolerance = tolerance
+        self.max_absorbed = max_absorbed
+        self.dropped = 0
+        self.reset()
+
+    def reset(self):
+        """Forgets the anchor so the current last point of the stroke is never moved."""
+        self._anchor = None
+        self._absorbed = []
+
+    def push(self, stroke, x, y):
+        """Adds (x, y) to stroke. Returns 'append', 'replace' or None if the point was dropped."""
+        x, y = int(x), int(y)
+        last = stroke.last_point()
+        if last is None:
+            stroke.append(x, y)
+            self.reset()
+            return 'append'
+        if math.hypot(x - last[0], y - last[1]) < self.min_distance:
+            self.dropped += 1
+            return None
+
+        if self._anchor is not None and len(self._absorbed) < self.max_absorbed:
+            candidates = self._absorbed + [last]
+            if all(self._distance_to_segment(p, self._anchor, (x, y)) <= self.tolerance for p in candidates):
+                stroke.replace_last(x, y)
+                self._absorbed.append(last)
+                self.dropped += 1
+                return 'replace'
+
+        stroke.append(x, y)
+        self._anchor = last
+        self._absorbed = []
+        return 'append'
+
+    @staticmethod
+    def _distance_to_segment(p, a, b):
+        ax, ay = a
+        dx, dy = b[0] - ax, b[1] - ay
+        length_sq = dx * dx + dy * dy
+        if length_sq == 0:
+            return math.hypot(p[0] - ax, p[1] - ay)
+        t = max(0.0, min(1.0, ((p[0] - ax) * dx + (p[1] - ay) * dy) / length_sq))
+        return math.hypot(p[0] - (ax + t * dx), p[1] - (ay + t * dy))
+
+
+def encode_stroke(stroke):
+    """Packs a stroke as its style, the first point as int32 and the rest as int16 deltas.
+
+    Uses about half the memory of the array('i') points for long strokes (4 vs 8 bytes a point).
+    """
+    color = stroke.color.encode('utf-8')
+    points = np.frombuffer(stroke.points, np.int32).reshape(-1, 2)
+    deltas = np.diff(points, axis=0)
+    if deltas.size and (deltas.min() < -32768 or deltas.max() > 32767):
+        raise ValueError("Stroke has a jump too large for int16 deltas")
+    header = struct.pack('<B', len(color)) + color + struct.pack(
+        '<HBI', int(stroke.width), TOOLS.index(stroke.tool), len(points)
+    )
+    first = points[:1].astype('<i4').tobytes()
+    return header + first + deltas.astype('<i2').tobytes()
+
+
+def decode_stroke(data, offset=0):
+    """Unpacks one stroke written by encode_stroke. Returns (stroke, offset after it)."""
+    color_len = data[offset]
+    offset += 1
+    color = bytes(data[offset:offset + color_len]).decode('utf-8')
+    offset += color_len
+    width, tool, count = struct.unpack_from('<HBI', data, offset)
+    offset += struct.calcsize('<HBI')
+
+    stroke = Stroke(color, width, TOOLS[tool])
+    if count:
+        first = np.frombuffer(data, '<i4', 2, offset)
+        offset += 8
+        deltas = np.frombuffer(data, '<i2', (count - 1) * 2, offset).reshape(-1, 2)
+        offset += deltas.nbytes
+        points = np.empty((count, 2), np.int32)
+        points[0] = first
+        np.cumsum(deltas, axis=0, out=points[1:])
+        points[1:] += first
+        stroke.points = array('i', points.tobytes())
+    stroke.freeze()
+    return stroke, offset
+
+
+def encode_strokes(strokes):
+    """Packs a list of strokes into one bytes blob."""
+    return STROKE_MAGIC + struct.pack('<I', len(strokes)) + b''.join(encode_stroke(s) for s in strokes)
+
+
+def decode_strokes(data):
+    """Unpacks a blob written by encode_strokes."""
+    if bytes(data[:4]) != STROKE_MAGIC:
+        raise ValueError("Not a stroke blob")
+    (count,) = struct.unpack_from('<I', data, 4)
+    offset = 8
+    strokes = []
+    for _ in range(count):
+        stroke, offset = decode_stroke(data, offset)
+        strokes.append(stroke)
+    return strokes
+
+
+class StrokeLayer:
+    """Draws strokes on a tk.Canvas as growing polylines instead of one item per segment.
+
+    The active stroke is a single line item whose coordinates are replaced
+    with coords() as points arrive. Once an item holds max_points_per_item
+    points it is left as is and a new item continues from its last point, so
+    each update costs O(max_points_per_item) no matter how long the stroke is.
+    """
+
+    def __init__(self, canvas, max_points_per_item=256, simplifier=None):
+        self.canvas = canvas
+        self.max_points_per_item = max_points_per_item
+        self.simplifier = simplifier or StrokeSimplifier()
+        self.strokes = []  # Finished strokes
+        self.active = None
+        self._line_options = {}
+        self._item = None  # Canvas item of the active chunk
+        self._chunk_start = 0  # Index into active.points where the active chunk starts
+
+    def begin(self, color, width, tool='pen', **line_options):
+        """Starts a new stroke, finishing the active one first."""
+        self.end()
+        self.active = Stroke(color, width, tool)
+        self._line_options = line_options
+        self._item = None
+        self._chunk_start = 0
+        self.simplifier.reset()
+        return self.active
+
+    def add_point(self, x, y, color=None, width=None, tool='pen', **line_options):
+        """Appends a point to the active stroke.
+
+        A new stroke is started if none is active or if color, width or tool
+        changed since it began.
+        """
+        stroke = self.active
+        if stroke is None or (color is not None and (color, width, tool) != (stroke.color, stroke.width, stroke.tool)):
+            stroke = self.begin(color, width, tool, **line_options)
+        if self.simplifier.push(stroke, x, y) is not None:
+            self._render()
+
+    def end(self):
+        """Finishes the active stroke, if any."""
+        if self.active is None:
+            return
+        if len(self.active):
+            self.active.freeze()
+            self.strokes.append(self.active)
+        self.active = None
+        self._item = None
+
+    def clear(self):
+        """Removes every stroke and its canvas items."""
+        self.end()
+        self.canvas.delete("stroke")
+        self.strokes = []
+
+    def replay(self, strokes, **line_options):
+        """Draws finished strokes, e.g. ones loaded from disk, and adds them to the layer."""
+        self.end()
+        step = self.max_points_per_item * 2
+        for stroke in strokes:
+            points = stroke.points
+            if len(points) < 4:
+                self.strokes.append(stroke)
+                continue
+            # Same chunking as live drawing, consecutive chunks sharing their end point
+            for start in range(0, max(len(points) - 2, 1), step - 2):
+                chunk = points[start:start + step]
+                if len(chunk) >= 4:
+                    self.canvas.create_line(
+                        *chunk, fill=stroke.color, width=stroke.width, tags="stroke", **line_options
+                    )
+            self.strokes.append(stroke)
+        self.canvas.tag_raise("pointer")
+
+    def _render(self):
+        stroke = self.active
+        chunk = stroke.points[self._chunk_start:]
+        if len(chunk) < 4:
+            return  # Tk needs two points for a line
+        if self._item is None:
+            self._item = self.canvas.create_line(
+                *chunk, fill=stroke.color, width=stroke.width, tags="stroke", **self._line_options
+            )
+            self.canvas.tag_raise("pointer")  # Keep the pointer above new ink
+        else:
+            self.canvas.coords(self._item, *chunk)
+
+        if len(chunk) // 2 >= self.max_points_per_item:
+            # Leave this item frozen and continue the stroke in a fresh one from its last point
+            self._chunk_start = len(stroke.points) - 2
+            self._item = None
+            self.simplifier.reset()  # The shared point now belongs to the frozen item too
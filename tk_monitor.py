@@ -0,0 +1,126 @@
+import os
+import time
+from bisect import bisect_right
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+HUD_ENV_VAR = "AIR_TRACKER_HUD"
+
+
+class CallbackStats:
+    """Lag and duration histograms of one named callback."""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.lag_hist = [0] * (len(BUCKETS_MS) + 1)
+        self.duration_hist = [0] * (len(BUCKETS_MS) + 1)
+        self.max_lag_ms = 0.0
+        self.max_duration_ms = 0.0
+        self.total_duration_ms = 0.0
+
+    def add(self, lag_ms, duration_ms):
+        self.count += 1
+        self.lag_hist[bisect_right(BUCKETS_MS, lag_ms)] += 1
+        self.duration_hist[bisect_right(BUCKETS_MS, duration_ms)] += 1
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self.max_duration_ms = max(self.max_duration_ms, duration_ms)
+        self.total_duration_ms += duration_ms
+
+    def mean_duration_ms(self):
+        return self.total_duration_ms / self.count if self.count else 0.0
+
+
+class TkLoopMonitor:
+    """Schedules Tk callbacks through after()/after_idle() and measures how they run.
+
+    For every call it records the lag (how long after its due time the
+    callback actually started) and its duration, both grouped under the
+    callback's name. A callback with a long duration is what makes the
+    others lag.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.stats = {}
+
+    def after(self, widget, delay_ms, callback, *args, name=None):
+        """Same as widget.after(delay_ms, callback, *args), but measured."""
+        due = self.clock() + delay_ms / 1000.0
+        return widget.after(delay_ms, self._wrap(callback, args, due, name))
+
+    def after_idle(self, widget, callback, *args, name=None):
+        """Same as widget.after_idle(callback, *args), but measured."""
+        return widget.after_idle(self._wrap(callback, args, self.clock(), name))
+
+    def _wrap(self, callback, args, due, name):
+        name = name or getattr(callback, "__qualname__", None) or repr(callback)
+
+        def run():
+            start = self.clock()
+            try:
+                return callback(*args)
+            finally:
+                end = self.clock()
+                self.record(name, max(start - due, 0.0) * 1000, (end - start) * 1000)
+        return run
+
+    def record(self, name, lag_ms, duration_ms):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = CallbackStats(name)
+        stats.add(lag_ms, duration_ms)
+
+    def worst_offenders(self, n=5):
+        """Callbacks with the longest worst-case duration first."""
+        return sorted(self.stats.values(), key=lambda s: s.max_duration_ms, reverse=True)[:n]
+
+    def reset(self):
+        self.stats = {}
+
+    def report(self, n=5):
+        """Text report of the worst offenders with their lag and duration histograms."""
+        labels = [f"<{b}" for b in BUCKETS_MS] + [f">={BUCKETS_MS[-1]}"]
+        lines = ["Tk callbacks (ms buckets: " + " ".join(labels) + ")"]
+        for stats in self.worst_offenders(n):
+            lines.append(
+                f"{stats.name}: n={stats.count} mean={stats.mean_duration_ms():.1f}ms "
+                f"max={stats.max_duration_ms:.1f}ms max_lag={stats.max_lag_ms:.1f}ms"
+            )
+            lines.append("  lag      " + " ".join(f"{c:>4}" for c in stats.lag_hist))
+            lines.append("  duration " + " ".join(f"{c:>4}" for c in stats.duration_hist))
+        return "\n".join(lines)
+
+    def hud_text(self, n=3):
+        """A few short lines for the on-screen HUD."""
+        lines = []
+        for stats in self.worst_offenders(n):
+            name = stats.name.rsplit(".", 1)[-1][:16]
+            lines.append(f"{name:<16} {stats.mean_duration_ms():5.1f}/{stats.max_duration_ms:5.1f}ms lag {stats.max_lag_ms:5.1f}")
+        return "\n".join(lines) or "no callbacks yet"
+
+
+class LoopHud:
+    """Shows TkLoopMonitor.hud_text() in a label, refreshed every interval_ms."""
+
+    def __init__(self, label, monitor, interval_ms=500):
+        self.label = label
+        self.monitor = monitor
+        self.interval_ms = interval_ms
+
+    def start(self):
+        self.monitor.after(self.label, self.interval_ms, self.refresh, name="hud")
+
+    def refresh(self):
+        if not self.label.winfo_exists():
+            return
+        self.label.config(text=self.monitor.hud_text())
+        self.start()
+
+
+def hud_enabled():
+    return os.environ.get(HUD_ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+# One monitor for every Tk callback of the app
+shared_monitor = TkLoopMonitor()
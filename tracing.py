@@ -0,0 +1,144 @@
+"""Per-frame latency traces from frame capture to emitted keystroke.
+
+Each frame gets a trace that collects monotonic (time.perf_counter)
+timestamps as it passes capture, detection, classification, debouncing,
+dispatch and finally the input backend. Traces can be exported as Chrome
+trace-event JSON (open in chrome://tracing or ui.perfetto.dev).
+
+Run headless against a recording to check the slide-advance SLA:
+
+    python tracing.py replay:session.mp4 --output trace.json
+"""
+import argparse
+import json
+import time
+from collections import OrderedDict
+
+SLIDE_ADVANCE_SLA_MS = 150
+
+
+class Trace:
+    """Timestamps of one frame on its way through the pipeline."""
+
+    def __init__(self, trace_id, captured_at):
+        self.id = trace_id
+        self.hops = [('capture', captured_at)]
+        self.actions = []  # (method, args, timestamp) sent to the input backend
+
+    @property
+    def captured_at(self):
+        return self.hops[0][1]
+
+
+class FrameTracer:
+    """Keeps the last capacity traces; current is the trace of the frame being handled."""
+
+    def __init__(self, capacity=1000, clock=time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+        self.traces = OrderedDict()
+        self.current = None
+        self._next_id = 1
+
+    def begin(self, captured_at=None):
+        """Starts the trace of a new frame and makes it current."""
+        trace = Trace(self._next_id, self.clock() if captured_at is None else captured_at)
+        self._next_id += 1
+        self.traces[trace.id] = trace
+        if len(self.traces) > self.capacity:
+            self.traces.popitem(last=False)
+        self.current = trace
+        return trace
+
+    def mark(self, hop, trace=None):
+        """Records that the current (or given) trace reached hop now."""
+        trace = trace or self.current
+        if trace is not None:
+            trace.hops.append((hop, self.clock()))
+
+    def emitted(self, method, args, trace=None):
+        """Records an input event sent on behalf of trace (default: the current one)."""
+        trace = trace or self.current
+        if trace is not None:
+            now = self.clock()
+            trace.hops.append(('emit', now))
+            trace.actions.append((method, args, now))
+
+    def action_latencies(self, method=None, args=None):
+        """Capture-to-emit latencies in ms, optionally only for one method (and arguments)."""
+        latencies = []
+        for trace in self.traces.values():
+            for action_method, action_args, t in trace.actions:
+                if method is not None and action_method != method:
+                    continue
+                if args is not None and tuple(action_args) != tuple(args):
+                    continue
+                latencies.append((t - trace.captured_at) * 1000)
+        return latencies
+
+    def sla_report(self, sla_ms=SLIDE_ADVANCE_SLA_MS, method='press', args=('right',)):
+        """Latency summary of one action (slide advance by default) against an SLA."""
+        latencies = sorted(self.action_latencies(method, args))
+        if not latencies:
+            return {'count': 0, 'sla_ms': sla_ms}
+        return {
+            'count': len(latencies),
+            'p50_ms': latencies[len(latencies) // 2],
+            'p95_ms': latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)],
+            'max_ms': latencies[-1],
+            'sla_ms': sla_ms,
+            'over_sla': sum(1 for latency in latencies if latency > sla_ms),
+        }
+
+    def to_chrome_trace(self, only_actions=False):
+        """Chrome trace-event dict: one complete event per hop, one row per frame."""
+        events = []
+        for trace in self.traces.values():
+            if only_actions and not trace.actions:
+                continue
+            previous_hop, previous_t = trace.hops[0]
+            for hop, t in trace.hops[1:]:
+                events.append({
+                    'name': hop, 'cat': 'pipeline', 'ph': 'X', 'pid': 1, 'tid': trace.id,
+                    'ts': previous_t * 1e6, 'dur': max(t - previous_t, 0.0) * 1e6,
+                    'args': {'trace_id': trace.id, 'after': previous_hop},
+                })
+                previous_hop, previous_t = hop, t
+            for method, args, t in trace.actions:
+                events.append({
+                    'name': f"{method}{tuple(args)}", 'cat': 'action', 'ph': 'i', 's': 't', 'pid': 1,
+                    'tid': trace.id, 'ts': t * 1e6,
+                    'args': {'trace_id': trace.id, 'latency_ms': (t - trace.captured_at) * 1000},
+                })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export(self, path, only_actions=False):
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(only_actions), f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('source', help="frame source: replay:<path>, synthetic, camera:N or a video path")
+    parser.add_argument('--frames', type=int, default=None, help="stop after this many frames")
+    parser.add_argument('--output', default='trace.json', help="Chrome trace-event JSON file")
+    parser.add_argument('--sla-ms', type=float, default=SLIDE_ADVANCE_SLA_MS)
+    args = parser.parse_args(argv)
+
+    from camera import CameraHandler
+    from input_backend import RecordingBackend
+
+    backend = RecordingBackend()
+    handler = CameraHandler(None, None, detection_mode='inline', source=args.source, input_backend=backend)
+    processed = handler.run_headless(args.frames)
+    handler.actions.wait_idle(timeout=5.0)  # Actions are emitted on the executor's worker
+    handler.tracer.export(args.output, only_actions=True)
+
+    print(f"Processed {processed} frames, {len(backend.events)} input events, trace written to {args.output}")
+    report = handler.tracer.sla_report(args.sla_ms)
+    print(json.dumps(report, indent=2))
+    return 1 if report.get('over_sla') else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -2,13 +2,16 @@ import os
 import time
 import threading
 import subprocess
-import pythoncom
-import comtypes.client
-from pynput.mouse import Listener
 from tkinter import messagebox, Toplevel, Label
-from camera import start_camera
-import win32gui
-import win32con
+from tk_monitor import LoopHud, hud_enabled, shared_monitor
+from startup import lazy_import, IS_WINDOWS
+
+# Imported on first use; the Windows-only ones are shims elsewhere so the GUI still starts
+pythoncom = lazy_import("pythoncom", windows_only=True)
+comtypes = lazy_import("comtypes", windows_only=True)
+win32gui = lazy_import("win32gui", windows_only=True)
+win32con = lazy_import("win32con", windows_only=True)
+mouse = lazy_import("pynput.mouse")
 
 overlay_window = None
 powerpoint_lock = threading.Lock()
@@ -29,7 +32,10 @@ def initialize_listener():
     def on_click(x, y, button, pressed):
         if pressed:
             focus_powerpoint_window()
-    Listener(on_click=on_click).start()
+    try:
+        mouse.Listener(on_click=on_click).start()
+    except Exception as e:
+        print(f"Error starting mouse listener: {e}")
 
 def focus_powerpoint_window():
     try:
@@ -79,6 +85,13 @@ def run_powerpoint(ppt_file, root):
     powerpoint = None
     presentation = None
 
+    if not IS_WINDOWS:
+        messagebox.showerror("Error", "Presenting needs PowerPoint, which is only available on Windows.")
+        return
+
+    from slide_annotations import SlideTracker  # Pulls in numpy; keep it off the startup path
+    slides = SlideTracker()  # Show position handed from this (COM) thread to the overlay
+
     try:
         pythoncom.CoInitialize()
         print("Initializing PowerPoint application...")
@@ -99,8 +112,13 @@ def run_powerpoint(ppt_file, root):
         if powerpoint.SlideShowWindows.Count == 0:
             raise Exception("Slideshow mode could not be started. Please ensure the PowerPoint file is valid.")
         print("Displaying camera overlay...")
-        display_camera_overlay(root)
+        display_camera_overlay(root, ppt_file, slides)
         while powerpoint.SlideShowWindows.Count > 0:
+            try:
+                # COM objects belong to this thread; the overlay only ever sees the index
+                slides.report(int(powerpoint.SlideShowWindows(1).View.CurrentShowPosition))
+            except comtypes.COMError:
+                pass  # Busy, or the show just ended
             time.sleep(0.5)
     except comtypes.COMError as e:
         print(f"Error running PowerPoint presentation: {e}")
@@ -114,7 +132,7 @@ def run_powerpoint(ppt_file, root):
                     presentation = powerpoint.Presentations.Open(ppt_file)
                     presentation.SlideShowSettings.Run()
                     time.sleep(2)
-                    display_camera_overlay(root)
+                    display_camera_overlay(root, ppt_file, slides)
                     break
                 except comtypes.COMError as retry_e:
                     print(f"Retry attempt {attempt} failed: {retry_e}")
@@ -143,7 +161,7 @@ def run_powerpoint(ppt_file, root):
             overlay_window.destroy()
         pythoncom.CoUninitialize()
 
-def display_camera_overlay(root):
+def display_camera_overlay(root, ppt_file=None, slides=None):
     global overlay_window
     if overlay_window and overlay_window.winfo_exists():
         overlay_window.destroy()
@@ -153,4 +171,15 @@ def display_camera_overlay(root):
     overlay_window.geometry("300x200+1620+0")
     camera_label = Label(overlay_window)
     camera_label.pack()
-    threading.Thread(target=start_camera, args=(camera_label,), daemon=True).start()
+    if hud_enabled():
+        # Event-loop HUD over the camera feed: worst callbacks by duration, and their lag
+        hud_label = Label(overlay_window, font=("Consolas", 7), justify="left", anchor="nw", bg="black", fg="#39FF14")
+        hud_label.place(x=0, y=0)
+        LoopHud(hud_label, shared_monitor).start()
+    threading.Thread(target=_start_camera, args=(camera_label, ppt_file, slides), daemon=True).start()
+
+
+def _start_camera(camera_label, ppt_file, slides=None):
+    # The vision stack (cv2, cvzone, MediaPipe, ...) is only imported once the first overlay opens
+    from camera import start_camera
+    start_camera(camera_label, ppt_file=ppt_file, slides=slides)